@@ -6,15 +6,17 @@ import arcade
 import math
 
 from constants import *
+from utils.AssetManager import asset_manager
+
+# Chemin principal pour les fichiers d'animation
+MAIN_PATH = ":resources:images/animated_characters/male_adventurer/maleAdventurer"
+WALK_FRAMES = 8
 
 def load_texture_pair(filename):
     """
     Load a texture pair, with the second being a mirror image.
     """
-    return [
-        arcade.load_texture(filename),
-        arcade.load_texture(filename, flipped_horizontally=True),
-    ]
+    return asset_manager.load_texture_pair(filename)
 
 class PlayerCharacter(arcade.Sprite):
     """Player Sprite with animations for walking and idle states, no jumping"""
@@ -30,16 +32,13 @@ class PlayerCharacter(arcade.Sprite):
         self.cur_texture = 0
         self.scale = CHARACTER_SCALING
 
-        # Chemin principal pour les fichiers d'animation
-        main_path = ":resources:images/animated_characters/male_adventurer/maleAdventurer"
-
         # Charger les textures idle (statique)
-        self.idle_texture_pair = load_texture_pair(f"{main_path}_idle.png")
+        self.idle_texture_pair = load_texture_pair(f"{MAIN_PATH}_idle.png")
 
         # Charger les textures de marche
         self.walk_textures = []
-        for i in range(8):  # 8 frames pour la marche
-            texture = load_texture_pair(f"{main_path}_walk{i}.png")
+        for i in range(WALK_FRAMES):  # 8 frames pour la marche
+            texture = load_texture_pair(f"{MAIN_PATH}_walk{i}.png")
             self.walk_textures.append(texture)
 
         # Définir la texture initiale
@@ -52,6 +51,15 @@ class PlayerCharacter(arcade.Sprite):
         self.change_x = 0
         self.change_y = 0
 
+    def reset(self):
+        """ Remettre le personnage immobile, visible et tourné vers la droite """
+        self.change_x = 0
+        self.change_y = 0
+        self.visible = True
+        self.facing_direction = RIGHT_FACING
+        self.cur_texture = 0
+        self.texture = self.idle_texture_pair[RIGHT_FACING]
+
     def update_animation(self, delta_time: float = 1 / 60):
         """ Gérer l'animation en fonction du mouvement du personnage """
 
@@ -92,22 +100,11 @@ class PlayerCharacter(arcade.Sprite):
         # Mettre à jour l'animation du joueur
         self.update_animation()
 
-    def on_key_press(self, key, modifiers):
-        """ Gérer les touches de déplacement """
-        if key == arcade.key.RIGHT:
-            self.change_x = PLAYER_MOVEMENT_SPEED
+    def move(self, direction_x, direction_y):
+        """ Marcher dans la direction des flèches tenues (chaque coordonnée vaut -1, 0 ou 1) """
+        self.change_x = direction_x * PLAYER_MOVEMENT_SPEED
+        self.change_y = direction_y * PLAYER_MOVEMENT_SPEED
+        if direction_x > 0:
             self.facing_direction = RIGHT_FACING
-        elif key == arcade.key.LEFT:
-            self.change_x = -PLAYER_MOVEMENT_SPEED
+        elif direction_x < 0:
             self.facing_direction = LEFT_FACING
-        elif key == arcade.key.UP:
-            self.change_y = PLAYER_MOVEMENT_SPEED
-        elif key == arcade.key.DOWN:
-            self.change_y = -PLAYER_MOVEMENT_SPEED
-
-    def on_key_release(self, key, modifiers):
-        """ Gérer le relâchement des touches """
-        if key == arcade.key.RIGHT or key == arcade.key.LEFT:
-            self.change_x = 0
-        elif key == arcade.key.UP or key == arcade.key.DOWN:
-            self.change_y = 0
\ No newline at end of file
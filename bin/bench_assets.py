@@ -0,0 +1,53 @@
+"""
+Walk through every map with a memory budget just above what the
+introduction needs, and print the counters of the asset manager at each
+step: the textures of the maps left behind are given back and evicted
+when the next ones are loaded, then loaded again when the game restarts.
+Run it from the root of the project (with ARCADE_HEADLESS=1 when there is
+no display):
+python bin/bench_assets.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import arcade
+import arcade.gui
+from constants import PLAYER_BORDER_PADDING, SCREEN_HEIGHT, SCREEN_TITLE, SCREEN_WIDTH
+from utils.AssetManager import asset_manager
+from utils.GameView import GameView
+
+
+def print_stats(step):
+    stats = asset_manager.stats()
+    print(f"{step:24} {stats['entries']:8} {stats['referenced']:11} "
+          f"{stats['bytes_resident'] / 1e6:9.1f} {stats['hits']:5} {stats['misses']:7} "
+          f"{stats['evictions']:10}")
+
+
+def main():
+    window = arcade.Window(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE, visible=False)
+    game_view = GameView()
+    window.show_view(game_view)
+    # Room for the introduction and a little more
+    asset_manager.set_memory_budget(asset_manager.bytes_resident + 64 * 1024)
+
+    print(f"{'step':24} {'entries':>8} {'referenced':>11} {'MB':>9} {'hits':>5} "
+          f"{'misses':>7} {'evictions':>10}")
+    print_stats("introduction")
+    game_view.views[0].on_lets_go_click(None)
+    print_stats(type(game_view.views[1]).__name__)
+    for index in range(2, len(game_view.views)):
+        # Cross the right edge of the screen to reach the next map
+        game_view.player_sprite.center_x = SCREEN_WIDTH - PLAYER_BORDER_PADDING + 1
+        game_view.on_tick(game_view.timestep.tick)
+        print_stats(type(game_view.views[index]).__name__)
+
+    game_view.views[-1].on_restart_button_click(None)
+    print_stats("restart")
+    window.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Measure the load time and the resident memory of the game musics, fully
+decoded (arcade.load_sound) against streamed from disk (utils.Music).
+Each mode runs in its own process so the memory numbers do not mix.
+Run it from the root of the project: python bin/bench_audio.py
+"""
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MUSICS = [
+    "assets/sounds/intro.mp3",
+    "assets/sounds/present.mp3",
+    "assets/sounds/passe.mp3",
+    "assets/sounds/game_over_sound.mp3",
+]
+
+
+def resident_memory():
+    """ Resident set size of this process, in bytes (Linux only) """
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def measure(mode):
+    import arcade
+    from utils.Music import Music
+
+    before = resident_memory()
+    start = time.perf_counter()
+    if mode == "static":
+        sounds = [arcade.load_sound(path) for path in MUSICS]
+    else:
+        sounds = [Music(path) for path in MUSICS]
+        # Opening the decoders is part of the cost of starting the music
+        sources = [music.open_source() for music in sounds]
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{mode:10} {elapsed:10.1f} ms {(resident_memory() - before) / 1024 / 1024:10.1f} MB")
+
+
+def main():
+    if len(sys.argv) > 1:
+        measure(sys.argv[1])
+        return
+    print(f"{'mode':10} {'load time':>13} {'resident':>13}")
+    for mode in ("static", "streaming"):
+        subprocess.run([sys.executable, __file__, mode], check=True)
+
+
+if __name__ == "__main__":
+    main()
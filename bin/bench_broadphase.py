@@ -0,0 +1,76 @@
+"""
+Count the exact collision tests of the game over checks of the ski and
+forest maps, before (every enemy of every layer, every frame) and with
+the broad phase, while the player walks across the map. Run it from the
+root of the project (with ARCADE_HEADLESS=1 when there is no display):
+python bin/bench_broadphase.py
+"""
+import os
+import random
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import arcade
+from constants import SCREEN_HEIGHT, SCREEN_WIDTH
+from maps.ForestMap import ForestMap
+from maps.WinterMap import TILE_SCALING, TILE_SIZE, WinterMap
+from Player import PlayerCharacter
+from utils.tense import Tense
+
+FRAMES = 2000
+
+
+def walk(player, rng):
+    """ Random walk of the player over the screen """
+    player.center_x = min(SCREEN_WIDTH, max(0, player.center_x + rng.choice((-5, 0, 5))))
+    player.center_y = min(SCREEN_HEIGHT, max(0, player.center_y + rng.choice((-5, 0, 5))))
+
+
+def run(name, view, layers_before, game_over_before, update):
+    """ Walk the player, check both ways agree and print the tests per frame """
+    player = view.player_sprite
+    rng = random.Random(1)
+    player.center_x, player.center_y = SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2
+    before = 0
+    hits = 0
+    for frame in range(FRAMES):
+        view.tense = Tense.PAST if frame // 500 % 2 else Tense.PRESENT
+        walk(player, rng)
+        update()
+        # Before: every layer was tested in full
+        before += sum(len(view.scene[layer]) for layer in layers_before)
+        expected = game_over_before()
+        candidates = view.game_over_candidates()
+        got = bool(candidates) and view.broad_phase.collides(player, *candidates)
+        view.broad_phase.next_frame()
+        assert expected == got
+        hits += got
+    after = view.broad_phase.total_narrow_tests / FRAMES
+    print(f"{name:8} {before / FRAMES:14.1f} {after:13.2f} {hits:6}")
+
+
+def main():
+    arcade.Window(SCREEN_WIDTH, SCREEN_HEIGHT, visible=False)
+    player = PlayerCharacter()
+    game_view = SimpleNamespace(player_sprite=player)
+    winter = WinterMap(game_view, player)
+    forest = ForestMap(game_view, player)
+
+    print(f"{'map':8} {'tests before':>14} {'tests after':>13} {'hits':>6}")
+    def collides(view, layer):
+        return bool(arcade.check_for_collision_with_list(player, view.scene[layer]))
+
+    # The conditions as they were written before
+    run("Ski", winter, ["past-monsters", "present-monsters"],
+        lambda: (winter.tense == Tense.PRESENT and collides(winter, "present-monsters")
+                 or winter.tense == Tense.PAST and collides(winter, "past-monsters")),
+        lambda: winter.move_monsters(3, TILE_SCALING * TILE_SIZE * 10))
+    run("Forest", forest, ["angry-dogs"],
+        lambda: forest.tense == Tense.PRESENT and collides(forest, "angry-dogs"),
+        forest.chase_by_dogs)
+
+
+if __name__ == "__main__":
+    main()
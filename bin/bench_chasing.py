@@ -0,0 +1,90 @@
+"""
+Stress test of the dogs chasing the player in the forest: spawn N angry
+dogs around the player and compare the cost of one chasing step with the
+old loop over the sprites and with the numpy chase group. Run it from the
+root of the project (with ARCADE_HEADLESS=1 when there is no display):
+python bin/bench_chasing.py [N ...]
+"""
+import math
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import arcade
+from constants import *
+from maps.ForestMap import ForestMap
+from Player import PlayerCharacter
+from utils.ChaseGroup import ChaseGroup
+
+DOG_COUNTS = [100, 1000, 10000]
+FRAMES = 20
+
+
+def chase_by_dogs_loop(dogs, player):
+    """ The chasing step as it was written before, one sprite at a time """
+    for dog in dogs:
+        distance = math.sqrt((dog.center_x - player.center_x) ** 2 +
+                             (dog.center_y - player.center_y) ** 2)
+        if distance < CHASING_DISTANCE:
+            x_diff = player.center_x - dog.center_x
+            y_diff = player.center_y - dog.center_y
+            distance = math.sqrt(x_diff ** 2 + y_diff ** 2)
+            if distance < 0.01:
+                continue
+            dog.center_x += (x_diff / distance) * CHASING_SPEED
+            dog.center_y += (y_diff / distance) * CHASING_SPEED
+
+
+def spawn_dogs(forest, count, seed):
+    """ Copies of the first angry dog, scattered within twice the chasing distance """
+    model = forest.scene["angry-dogs"][0]
+    player = forest.player_sprite
+    rng = random.Random(seed)
+    dogs = arcade.SpriteList(use_spatial_hash=True)
+    for _ in range(count):
+        dog = arcade.Sprite(texture=model.texture, scale=model.scale)
+        dog.center_x = player.center_x + rng.uniform(-2, 2) * CHASING_DISTANCE
+        dog.center_y = player.center_y + rng.uniform(-2, 2) * CHASING_DISTANCE
+        dogs.append(dog)
+    return dogs
+
+
+def frame_time(step, player):
+    """ Mean time of one chasing step while the player walks, in ms """
+    total = 0
+    for frame in range(FRAMES):
+        player.center_x += PLAYER_SPEED
+        start = time.perf_counter()
+        step()
+        total += time.perf_counter() - start
+    player.center_x -= FRAMES * PLAYER_SPEED
+    return total / FRAMES * 1000
+
+
+def main():
+    counts = [int(count) for count in sys.argv[1:]] or DOG_COUNTS
+    # The text of the map needs an OpenGL context
+    arcade.Window(SCREEN_WIDTH, SCREEN_HEIGHT, visible=False)
+    player = PlayerCharacter()
+    forest = ForestMap(SimpleNamespace(player_sprite=player), player)
+    player.center_x = SCREEN_WIDTH / 2
+    player.center_y = SCREEN_HEIGHT / 2
+
+    print(f"{'dogs':>6} {'loop (ms)':>10} {'numpy (ms)':>11} {'speed-up':>9}")
+    for count in counts:
+        loop_dogs = spawn_dogs(forest, count, count)
+        group_dogs = spawn_dogs(forest, count, count)
+        group = ChaseGroup(group_dogs, CHASING_DISTANCE, CHASING_SPEED)
+        loop = frame_time(lambda: chase_by_dogs_loop(loop_dogs, player), player)
+        vectorized = frame_time(lambda: group.update(player.center_x, player.center_y), player)
+        # Both ways must leave the dogs at the same place
+        assert all(a.position == b.position for a, b in zip(loop_dogs, group_dogs))
+        print(f"{count:6} {loop:10.2f} {vectorized:11.2f} {loop / vectorized:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Stress test of the monsters wandering on the ski map: spawn N monsters
+and compare the cost of one wander step with the old loop over the
+sprites and with the numpy wander group. Run it from the root of the
+project (with ARCADE_HEADLESS=1 when there is no display):
+python bin/bench_monsters.py [N ...]
+"""
+import math
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import arcade
+from constants import SCREEN_HEIGHT, SCREEN_WIDTH
+from maps.WinterMap import (HORIZONTAL_TILES, TILE_SCALING, TILE_SIZE, VERTICAL_TILES,
+                            WALL_LAYERS, WinterMap)
+from Player import PlayerCharacter
+from utils.WanderGroup import WanderGroup
+
+MONSTER_COUNTS = [11, 100, 1000, 10000]
+FRAMES = 20
+STEP = 3
+RADIUS = TILE_SCALING * TILE_SIZE * 10
+MAP_WIDTH = TILE_SCALING * HORIZONTAL_TILES * TILE_SIZE
+MAP_HEIGHT = TILE_SCALING * VERTICAL_TILES * TILE_SIZE
+
+
+def move_monsters_loop(monsters, walls):
+    """ The wander step as it was written before, one sprite at a time """
+    for monster in monsters:
+        if not hasattr(monster, 'initial_x'):
+            monster.initial_x = monster.center_x
+            monster.initial_y = monster.center_y
+        if not hasattr(monster, 'direction'):
+            monster.direction = random.choice(['up', 'down', 'left', 'right'])
+        old_x = monster.center_x
+        old_y = monster.center_y
+        if monster.direction == 'up':
+            monster.center_y += STEP
+        elif monster.direction == 'down':
+            monster.center_y -= STEP
+        elif monster.direction == 'left':
+            monster.center_x -= STEP
+        elif monster.direction == 'right':
+            monster.center_x += STEP
+        distance_from_start = math.sqrt((monster.center_x - monster.initial_x) ** 2 +
+                                        (monster.center_y - monster.initial_y) ** 2)
+        if (monster.center_x < 0 or monster.center_x > MAP_WIDTH or
+                monster.center_y < 0 or monster.center_y > MAP_HEIGHT or
+                arcade.check_for_collision_with_list(monster, walls) or
+                distance_from_start > RADIUS):
+            monster.center_x = old_x
+            monster.center_y = old_y
+            monster.direction = random.choice(['up', 'down', 'left', 'right'])
+
+
+def spawn_monsters(winter, count, seed):
+    """ Copies of the first monster of the past, anywhere on the map """
+    model = winter.scene["past-monsters"][0]
+    rng = random.Random(seed)
+    monsters = arcade.SpriteList()
+    for _ in range(count):
+        monster = arcade.Sprite(texture=model.texture, scale=model.scale)
+        monster.center_x = rng.uniform(0, MAP_WIDTH)
+        monster.center_y = rng.uniform(0, MAP_HEIGHT)
+        monsters.append(monster)
+    return monsters
+
+
+def frame_time(step):
+    """ Mean time of one wander step, in ms """
+    total = 0
+    for frame in range(FRAMES):
+        start = time.perf_counter()
+        step()
+        total += time.perf_counter() - start
+    return total / FRAMES * 1000
+
+
+def main():
+    counts = [int(count) for count in sys.argv[1:]] or MONSTER_COUNTS
+    # The text of the map needs an OpenGL context
+    arcade.Window(SCREEN_WIDTH, SCREEN_HEIGHT, visible=False)
+    player = PlayerCharacter()
+    winter = WinterMap(SimpleNamespace(player_sprite=player), player)
+    walls = arcade.SpriteList(use_spatial_hash=True)
+    walls.extend(winter.scene["decoration"])
+
+    print(f"{'monsters':>8} {'loop (ms)':>10} {'numpy (ms)':>11} {'µs/monster':>11}")
+    for count in counts:
+        loop_monsters = spawn_monsters(winter, count, count)
+        group = WanderGroup(spawn_monsters(winter, count, count), winter.tile_grid,
+                            WALL_LAYERS, MAP_WIDTH, MAP_HEIGHT, seed=count)
+        loop = frame_time(lambda: move_monsters_loop(loop_monsters, walls))
+        vectorized = frame_time(lambda: group.update(STEP, RADIUS))
+        print(f"{count:8} {loop:10.2f} {vectorized:11.2f} {vectorized * 1000 / count:11.2f}")
+
+
+if __name__ == "__main__":
+    main()
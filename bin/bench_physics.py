@@ -0,0 +1,64 @@
+"""
+Compare the physics cost per frame of the forest map before and after
+the walls got a spatial hash and a tile grid. Run it from the root of the project
+(with ARCADE_HEADLESS=1 when there is no display):
+python bin/bench_physics.py
+"""
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import arcade
+from constants import *
+from maps.ForestMap import ForestMap, MAP_NAME
+from Player import PlayerCharacter
+from utils.TilemapCache import load_tilemap
+
+FRAMES = 3000
+# Direction of the player, changed every SEGMENT frames
+DIRECTIONS = [(1, 0), (0, 1), (-1, 0), (0, -1), (1, 1), (-1, -1)]
+SEGMENT = 90
+
+
+def physics_time(engine, player):
+    """ Mean time of engine.update() while the player walks around, in µs """
+    player.center_x = PLAYER_START_X
+    player.center_y = PLAYER_START_Y
+    total = 0
+    for frame in range(FRAMES):
+        direction = DIRECTIONS[frame // SEGMENT % len(DIRECTIONS)]
+        player.change_x = direction[0] * PLAYER_SPEED
+        player.change_y = direction[1] * PLAYER_SPEED
+        start = time.perf_counter()
+        engine.update()
+        total += time.perf_counter() - start
+    return total / FRAMES * 1e6
+
+
+def main():
+    # The text of the map needs an OpenGL context
+    arcade.Window(SCREEN_WIDTH, SCREEN_HEIGHT, visible=False)
+    player = PlayerCharacter()
+
+    # Before: tile lists without spatial hash
+    scene = arcade.Scene.from_tilemap(load_tilemap(MAP_NAME, TILE_SCALING))
+    present_walls = [scene["angry-dogs"], scene["collectables"], scene["blocks"]]
+    before_engine = arcade.PhysicsEngineSimple(player, walls=present_walls)
+
+    # After: the map as the game builds it
+    forest = ForestMap(SimpleNamespace(player_sprite=player), player)
+
+    wall_tiles = sum(len(sprite_list) for sprite_list in present_walls)
+    print(f"Forest map: {len(scene['background'])} background cells, "
+          f"{wall_tiles} wall tiles in the present")
+    print(f"{'':24} {'before (µs)':>12} {'after (µs)':>11} {'speed-up':>9}")
+    before = physics_time(before_engine, player)
+    after = physics_time(forest.physics_engine, player)
+    print(f"{'physics per frame':24} {before:12.1f} {after:11.1f} {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Compare the load time of the maps through arcade.load_tilemap (JSON) and
+through the compiled cache. Run it from the root of the project:
+python bin/bench_tilemap.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import arcade
+from bin.compile_maps import COMPILED_MAPS
+from utils.TilemapCache import (CompiledTileMap, compile_tilemap,
+                                read_compiled_tilemap)
+
+REPEAT = 5
+
+
+def best_time(function):
+    """ Best wall-clock time of REPEAT calls, in milliseconds """
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    print(f"{'map':40} {'json (ms)':>10} {'cache (ms)':>11} {'speed-up':>9}")
+    for map_name, scaling in COMPILED_MAPS:
+        data, digest = read_compiled_tilemap(map_name, scaling)
+        if data is None:
+            compile_tilemap(map_name, scaling, digest=digest)
+
+        json_time = best_time(lambda: arcade.Scene.from_tilemap(
+            arcade.load_tilemap(map_name, scaling)))
+        cache_time = best_time(lambda: arcade.Scene.from_tilemap(
+            CompiledTileMap(read_compiled_tilemap(map_name, scaling)[0])))
+        print(f"{map_name:40} {json_time:10.1f} {cache_time:11.1f} {json_time / cache_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Write the resized variants of the full-screen backgrounds, one per window
+size of utils.Backgrounds.VARIANT_SIZES. A variant is only written when the
+source image is bigger than the size it is drawn at.
+Run it from the root of the project: python bin/build_backgrounds.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.Backgrounds import BACKGROUNDS, VARIANT_SIZES, build_variant
+
+
+def main():
+    for path, mode in BACKGROUNDS:
+        for width, height in VARIANT_SIZES:
+            output = build_variant(path, mode, width, height)
+            if output is None:
+                print(f"{path} {width}x{height}: source not bigger, skipped")
+            else:
+                print(f"{path} {width}x{height}: {os.path.getsize(path)} -> "
+                      f"{os.path.getsize(output)} bytes ({output})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Compile the Tiled maps of the game into the binary cache read at launch.
+Run it from the root of the project: python bin/compile_maps.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import maps.CityMap as city
+import maps.ForestMap as forest
+import maps.WinterMap as winter
+from utils.TilemapCache import cache_path, compile_tilemap, source_hash
+
+# Every map loaded through utils.TilemapCache, with its scaling
+COMPILED_MAPS = [
+    (city.MAP_NAME, city.TILE_SCALING),
+    (forest.MAP_NAME, forest.TILE_SCALING),
+    (winter.MAP_NAME, winter.TILE_SCALING),
+]
+
+
+def main():
+    for map_name, scaling in COMPILED_MAPS:
+        digest = source_hash(map_name, scaling)
+        compile_tilemap(map_name, scaling, digest=digest)
+        path = cache_path(map_name, digest)
+        print(f"{map_name} -> {path} ({os.path.getsize(path)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
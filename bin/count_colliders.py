@@ -0,0 +1,37 @@
+"""
+Number of colliders of the wall layers of each map, before (one per tile)
+and after merging the full tiles into rectangles. Run it from the root of
+the project:
+python bin/count_colliders.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import constants
+from maps import CityMap, ForestMap, WinterMap
+from utils.TileGrid import TileGrid
+from utils.TilemapCache import load_tilemap
+
+MAPS = [
+    ("City", CityMap.MAP_NAME, CityMap.TILE_SCALING, CityMap.GRID_LAYERS),
+    ("Forest", ForestMap.MAP_NAME, constants.TILE_SCALING, ForestMap.GRID_LAYERS),
+    ("Ski", WinterMap.MAP_NAME, WinterMap.TILE_SCALING, WinterMap.WALL_LAYERS),
+]
+
+
+def main():
+    print(f"{'map':8} {'layer':14} {'tiles':>6} {'colliders':>10}")
+    for title, map_name, scaling, layers in MAPS:
+        grid = TileGrid(load_tilemap(map_name, scaling), layers)
+        total_tiles = total_colliders = 0
+        for name, (tiles, colliders) in grid.collider_counts().items():
+            print(f"{title:8} {name:14} {tiles:6} {colliders:10}")
+            total_tiles += tiles
+            total_colliders += colliders
+        print(f"{title:8} {'total':14} {total_tiles:6} {total_colliders:10}")
+
+
+if __name__ == "__main__":
+    main()
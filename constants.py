@@ -20,7 +20,7 @@ PRESENT = "present"
 # TILE_SCALING = 0.5
 CHARACTER_SCALING = TILE_SCALING * .7
 
-# Movement speed of player, in pixels per frame
+# Movement speed of player, in pixels per tick
 PLAYER_MOVEMENT_SPEED = 5
 PLAYER_JUMP_SPEED = 15
 RIGHT_FACING = 0
@@ -31,3 +31,38 @@ PLAYER_START_Y = 100
 PLAYER_BORDER_PADDING = 10  # Padding for detecting map change
 HORIZONTAL_TILES = 45
 VERTICAL_TILES = 25
+
+# Map views loading
+PREFETCH_NEXT_VIEW = True  # Build the next map while the player idles in the current one
+
+# Assets
+ASSET_MEMORY_BUDGET = 256 * 1024 * 1024  # Bytes kept by the asset cache
+LOADING_WORKERS = 4  # Threads preparing the assets behind the loading screen
+LOADING_FRAME_BUDGET = 0.004  # Seconds of texture uploads per frame while loading
+LOADING_REPORT = False  # Log how long each asset took to load
+
+# Music
+MUSIC_VOLUME = 0.5
+MUSIC_FADE_DURATION = 0.3  # Seconds of crossfade when switching tense
+
+# Past effect
+PAST_TRANSITION_DURATION = 0.4  # Seconds to blend the past look in or out
+PAST_FADING = 0.3  # How much the past colors are washed out towards grey
+PAST_VIGNETTE = 0.8  # Darkness of the borders of the screen in the past
+
+# Texts
+FONT_NAME = ("calibri", "arial")  # Same fonts as arcade.draw_text
+
+# Frame pacing
+FRAME_INTERVAL = 1 / 60  # Seconds between updates while something happens
+DRAW_INTERVAL = 1 / 60  # Seconds between draws while something happens, 0 for as fast as possible
+IDLE_INTERVAL = 0.25  # Seconds between updates on a screen where nothing moves
+IDLE_DELAY = 1.0  # Seconds without activity before slowing down
+
+# Simulation
+SIMULATION_RATE = 60  # Ticks of the game logic per second, the speeds are given per tick
+MAX_TICKS_PER_UPDATE = 5  # Ticks run at most by one update, a longer pause is dropped
+INTERPOLATE_SPRITES = True  # Draw the moving sprites between their last two ticks
+
+# Chasing enemies
+FLOW_FIELD_WORKER = False  # Compute the paths to the player on a worker thread
@@ -1,7 +1,11 @@
+import logging
+
 import arcade
 import arcade.gui
 from constants import *
 from utils.GameView import GameView
+from utils.LoadingView import LoadingView
+from utils.FramePacer import install_event_loop
 
 
 
@@ -11,9 +15,13 @@ from utils.GameView import GameView
 
 def main():
     """ Main function """
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
     window = arcade.Window(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE)
-    game_view = GameView()
-    window.show_view(game_view)
+    # Load the assets behind a loading screen, then start the game
+    loading_view = LoadingView(GameView)
+    window.show_view(loading_view)
+    # Draw at the rate of the frame pacer, slower while nothing moves
+    install_event_loop()
     arcade.run()
 
 
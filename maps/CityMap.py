@@ -1,8 +1,13 @@
 import arcade
-import math
 from utils.BaseMapView import BaseMapView
 from utils.GameOverView import GameOverView
 from utils.tense import Tense
+from utils.TilemapCache import load_tilemap
+from utils.StaticLayerCache import StaticLayerCache
+from utils.TileGrid import TileGrid
+from utils.InteractableRegistry import InteractableRegistry
+from utils.BriefingPanel import BriefingPanel
+from utils.InputState import INTERACT, SWITCH_TENSE
 from constants import *
 
 # Constants specific to map1
@@ -13,11 +18,29 @@ COLLECTING_DISTANCE = (TILE_SIZE * TILE_SCALING) * 2
 CHASING_DISTANCE = TILE_SIZE * TILE_SCALING * 5
 PLAYER_SPEED = 5
 CHASING_SPEED = 2
+MAP_NAME = "assets/maps/city/City.json"
+# Layers that never change, drawn from a baked texture
+STATIC_LAYERS = ["wall", "terrain", "road", "destination", "immeuble", "decoration"]
+# Layers the player can bump into
+WALL_LAYERS = ["decoration", "immeuble", "present_car", "past_car", "road", "wall"]
+# Layers that never move, resolved cell by cell in a tile grid (the
+# destination is only tested against the car)
+GRID_LAYERS = ["decoration", "immeuble", "past_car", "road", "wall", "destination"]
+# The car the player drives is looked up through a spatial hash
+LAYER_OPTIONS = {name: {"use_spatial_hash": True}
+                 for name in WALL_LAYERS if name not in GRID_LAYERS}
 
 class CityMap(BaseMapView):
+  RESET_ATTRIBUTES = ('finish', 'tense', 'tool', 'is_car_fixed', 'drive_car',
+                      'car_direction', 'physics_engine', 'timeline_state')
+  TIMELINE_LAYERS = ('present_car', 'past_car', 'problem', 'tool')
+  # is_car_fixed
+  PROGRESS_FLAGS = 1
+
   def __init__(self, game_view, game_player_sprite):
     self.game_view = game_view
     self.player_sprite = game_player_sprite
+    self.init_assets()
     
     self.finish = False
     self.tile_map = None
@@ -27,140 +50,88 @@ class CityMap(BaseMapView):
     self.tool = False
     self.is_car_fixed = False
     self.drive_car = False
-    self.car_moving_key = None
+    self.car_direction = (0, 0)  # Arrows held while driving
     self.tool_sprite = None
+    self.static_layers = None
     self.setup()
+    self.take_snapshot()
+
+    # Story of the mission, laid out once
+    self.briefing = BriefingPanel("City Mission ", SCREEN_HEIGHT - 125, [
+      ("Reconnect with your friend by rejoining the weekly drawing class you both loved.",
+       SCREEN_HEIGHT - 175, arcade.color.WHITE),
+      ("You missed the chance before due to your car breaking down.",
+       SCREEN_HEIGHT - 205, arcade.color.WHITE),
+      ("But now, with a second chance, go back to the past, get the item to repair the car and come back to the present,so you can drive it",
+       SCREEN_HEIGHT - 235, arcade.color.YELLOW),
+    ], SCREEN_HEIGHT - 180, 150)
 
   def setup(self):
-    map_name = "assets/maps/city/City.json"
-    self.tile_map = arcade.load_tilemap(map_name, TILE_SCALING)
+    self.tile_map = load_tilemap(MAP_NAME, TILE_SCALING, LAYER_OPTIONS)
     self.scene = arcade.Scene.from_tilemap(self.tile_map)
+    self.static_layers = StaticLayerCache(self.scene, STATIC_LAYERS)
+    self.tile_grid = TileGrid(self.tile_map, GRID_LAYERS)
+    self.building_mask = self.tile_grid.layer_mask(["immeuble"])
+    self.destination_mask = self.tile_grid.layer_mask(["destination"])
 
     tool_source = "assets/maps/city/tool.png"
-    self.tool_sprite = arcade.Sprite(tool_source, .15)
+    self.tool_sprite = self.asset_sprite(tool_source, scale=.15)
     self.tool_sprite.center_x = 5 * TILE_SIZE * TILE_SCALING
     self.tool_sprite.center_y = 15 * TILE_SIZE * TILE_SCALING
     self.scene.add_sprite("tool", self.tool_sprite)
-    self.tool_sprite.visible = False
-    
-    # Setup physics engine
-    self.update_walls_in_engine([self.scene["decoration"], self.scene["immeuble"], self.scene["present_car"], self.scene["past_car"], self.scene["road"], self.scene["wall"]])
 
-  def update_walls_in_engine(self, walls):
-    self.physics_engine = arcade.PhysicsEngineSimple(
-      self.player_sprite, walls=walls
-    )
+    # Visible layers and physics engine of every tense and step of the puzzle
+    self.build_timeline()
+
+    # What ENTER can be used on, looked up around the tile of the player
+    self.interactables = InteractableRegistry(TILE_SIZE * TILE_SCALING)
+    self.interactables.register(self.scene["tool"], self.collect, COLLECTING_DISTANCE,
+                                Tense.PAST)
+    self.interactables.register(self.scene["present_car"], self.drive, COLLECTING_DISTANCE,
+                                Tense.PRESENT, lambda: self.drive_car)
+    self.interactables.register(self.scene["problem"], self.repar_car, COLLECTING_DISTANCE,
+                                Tense.PAST, lambda: self.tool)
+
+  def describe_timeline(self, tense, is_car_fixed):
+    walls = WALL_LAYERS
+    visible = [] if is_car_fixed else ["problem"]
+    if tense == Tense.PAST:
+      # The tool to repair the car can only be found in the past
+      return visible + ["past_car", "tool"], walls
+    return visible + ["present_car"], walls
+
+  def timeline_key(self):
+    return self.tense, self.is_car_fixed
 
  
   def on_draw(self):
     arcade.start_render()
-    self.scene.draw()
-
-    # Si on est dans le passé, dessiner un rectangle gris transparent
-    if self.tense == Tense.PAST:
-            # Rectangle gris transparent sur tout l'écran
-            arcade.draw_rectangle_filled(
-                SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2,  # Position au centre de l'écran
-                SCREEN_WIDTH, SCREEN_HEIGHT,  # Taille du rectangle pour couvrir tout l'écran
-                # Couleur grise avec une transparence (alpha = 150 sur 255)
-                (*arcade.color.GRAY, 150)
-            )
-
-            # Effet vignette : Rectangle noir transparent en bas
-            arcade.draw_rectangle_filled(
-                SCREEN_WIDTH // 2, 0,  # Position au bas de l'écran
-                SCREEN_WIDTH, 50,  # Largeur complète, hauteur réduite pour l'effet
-                arcade.color.BLACK
-            )
-
-            # Effet vignette : Rectangle noir transparent à gauche
-            arcade.draw_rectangle_filled(
-                0, SCREEN_HEIGHT // 2,  # Position à gauche de l'écran
-                50, SCREEN_HEIGHT,  # Largeur réduite, hauteur complète
-                arcade.color.BLACK
-            )
-
-            # Effet vignette : Rectangle noir transparent à droite
-            arcade.draw_rectangle_filled(
-                SCREEN_WIDTH, SCREEN_HEIGHT // 2,  # Position à droite de l'écran
-                50, SCREEN_HEIGHT,  # Largeur réduite, hauteur complète
-                arcade.color.BLACK
-            )
-
-        # Check if the player will be out of bounds
+    self.draw_scene()
+
+    # Show the mission while the player is low enough not to be hidden by it
     if self.player_sprite.center_y < SCREEN_HEIGHT-300:
+      self.briefing.draw()
+
+  def on_action(self, action):
+    if self.finish == False and self.player_sprite.visible == True:
+      if action == INTERACT:
+        self.interact()
+      elif action == SWITCH_TENSE:
+        self.switch_tense()
+
+  def on_direction(self, direction_x, direction_y):
+    self.car_direction = (0, 0)
+    if self.finish == False and self.player_sprite.visible == False:
+      # The player is in the car, the arrows drive it instead
+      self.player_sprite.change_x = 0
+      self.player_sprite.change_y = 0
+      if self.tense == Tense.PRESENT:
+        self.car_direction = (direction_x, direction_y)
 
-        rectangle_height = 150  # Increased to fit all text
-        arcade.draw_rectangle_filled(
-            SCREEN_WIDTH // 2, SCREEN_HEIGHT -
-            180, SCREEN_WIDTH, rectangle_height, arcade.color.BLACK + (200,)
-        )
-
-        # Draw the "At Killy's home" message centered inside the rectangle
-        arcade.draw_text("City Mission ", SCREEN_WIDTH // 2, SCREEN_HEIGHT - 125,  # Adjusted to be inside the rectangle
-                         arcade.color.GREEN, 24, anchor_x="center", anchor_y="center")
-
-        # Draw each part of the story, ensuring long lines are wrapped within the screen width
-        arcade.draw_text(
-            "Reconnect with your friend by rejoining the weekly drawing class you both loved.",
-            40, SCREEN_HEIGHT - 175,  # Adjusted to fit inside the rectangle
-            arcade.color.WHITE, 18, width=SCREEN_WIDTH - 80
-        )
-
-        arcade.draw_text(
-            "You missed the chance before due to your car breaking down.",
-            40, SCREEN_HEIGHT - 205,  # Adjusted to fit inside the rectangle
-            arcade.color.WHITE, 18, width=SCREEN_WIDTH - 80
-        )
-        arcade.draw_text(
-            "But now, with a second chance, go back to the past, get the item to repair the car and come back to the present,so you can drive it",
-            40, SCREEN_HEIGHT - 235,  # Adjusted to fit inside the rectangle
-            arcade.color.YELLOW, 18, width=SCREEN_WIDTH - 80
-        )
-    
-
-  def on_key_press(self, key, modifiers):
-    if self.finish == False :
-      if self.player_sprite.visible == True:
-        self.move_player([self.player_sprite], key)
-        if key == arcade.key.ENTER and self.tense == Tense.PAST :
-          self.near_sprites_in_list(self.scene["tool"], self.collect)
-        if self.drive_car == True and key == arcade.key.ENTER and self.tense == Tense.PRESENT : 
-          self.near_sprites_in_list(self.scene["present_car"], self.drive)
-        if self.tool == True and self.tense == Tense.PAST and key == arcade.key.ENTER:
-          self.near_sprites_in_list(self.scene["problem"], self.repar_car)
-        if key == arcade.key.SPACE:
-          self.switch_tense()
-      else:
-          if self.tense == Tense.PRESENT:
-            self.car_moving_key = key
-            self.move_sprites(self.scene["present_car"], key)
-
-  def move_player(self, sprites, key):
-    for sprite in sprites:
-        if key == arcade.key.UP:
-            sprite.change_y = PLAYER_SPEED
-        elif key == arcade.key.DOWN:
-            sprite.change_y = -PLAYER_SPEED
-        elif key == arcade.key.LEFT:
-            sprite.change_x = -PLAYER_SPEED
-        elif key == arcade.key.RIGHT:
-            sprite.change_x = PLAYER_SPEED
-    
-  def move_sprites(self, sprites, key):
-      # Initialize X and Y movement to 0
-      X = 0
-      Y = 0
-
-      # Check which key is pressed and set movement accordingly
-      if key == arcade.key.UP:
-          Y = PLAYER_SPEED * 3  # Move up
-      elif key == arcade.key.DOWN:
-          Y = -PLAYER_SPEED * 3 # Move down
-      elif key == arcade.key.LEFT:
-          X = -PLAYER_SPEED * 3  # Move left
-      elif key == arcade.key.RIGHT:
-          X = PLAYER_SPEED * 3  # Move right
+  def move_sprites(self, sprites, direction_x, direction_y):
+      # Move 3 times faster than the player
+      X = direction_x * PLAYER_SPEED * 3
+      Y = direction_y * PLAYER_SPEED * 3
 
       # Get the car sprites
       car_sprite_list = self.scene.get_sprite_list("present_car")
@@ -169,11 +140,11 @@ class CityMap(BaseMapView):
           # Calculate new position
           sprite.center_x = sprite.center_x + X
           sprite.center_y = sprite.center_y + Y
-          if arcade.check_for_collision_with_list(sprite, self.scene["immeuble"]):
+          if self.tile_grid.sprite_collides(sprite, self.building_mask):
               game_over_view = GameOverView(self.game_view)  # Crée une instance de la vue "Game Over"
               self.game_view.window.show_view(
                       game_over_view)  # Affiche la vue "Game Over"
-          if arcade.check_for_collision_with_list(sprite, self.scene["destination"]) :
+          if self.tile_grid.sprite_collides(sprite, self.destination_mask) :
             self.finish = True
          
              
@@ -183,51 +154,27 @@ class CityMap(BaseMapView):
 
   def collect(self, collectable):
     self.scene["tool"].remove(collectable)
+    self.interactables.remove(collectable)
     self.tool = True
 
   
   def repar_car(self, collectable):
     self.scene["problem"].remove(collectable)
+    self.interactables.remove(collectable)
     self.drive_car = True
 
   def drive(self, collectable):
     self.player_sprite.visible = False
 
   def switch_tense(self):
-    self.scene["problem"].visible = not self.is_car_fixed
-    if self.tense == Tense.PRESENT:
-      #print("changing tool ...")
-      self.tool_sprite.visible = True
-      #print(self.tool_sprite.visible)
-      self.scene["past_car"].visible = True
-      self.scene["present_car"].visible = False
-      self.tense = Tense.PAST
-    else:
-      self.tool_sprite.visible = False
-      self.scene["past_car"].visible = False
-      self.scene["present_car"].visible = True
-      self.tense = Tense.PRESENT
-
-  def near_sprites_in_list_aux(self, sprite_list_1, sprite_list_2, action, radius):
-    for sprite1 in sprite_list_1:
-        for sprite2 in sprite_list_2:
-          distance = math.sqrt((sprite1.center_x - sprite2.center_x) ** 2 + 
-                              (sprite1.center_y - sprite2.center_y) ** 2)
-          if distance < radius:
-            action(sprite1)
-            break
-
-  def near_sprites_in_list(self, sprite_list, action):
-    self.near_sprites_in_list_aux(sprite_list, [self.player_sprite], action, COLLECTING_DISTANCE)
-
-  def on_key_release(self, key, modifiers):
-    if key == arcade.key.UP or key == arcade.key.DOWN:
-      self.player_sprite.change_y = 0
-    elif key == arcade.key.LEFT or key == arcade.key.RIGHT:
-      self.player_sprite.change_x = 0
-    
-    if self.car_moving_key is not None :
-      self.car_moving_key = None
+    self.tense = Tense.PAST if self.tense == Tense.PRESENT else Tense.PRESENT
+    self.apply_timeline()
+
+  def is_active(self):
+    return self.car_direction != (0, 0)
+
+  def moving_sprites(self):
+    return self.scene["present_car"]
 
   def on_update(self, delta_time):
     # Update physics engine (for player and walls interaction)
@@ -238,8 +185,8 @@ class CityMap(BaseMapView):
                         (self.game_view.current_view + 1) % len(self.game_view.views))
             self.player_sprite.visible = True
             
-    if self.car_moving_key is not None:
-      self.move_sprites(self.scene["present_car"], self.car_moving_key)
+    if self.car_direction != (0, 0):
+      self.move_sprites(self.scene["present_car"], *self.car_direction)
 
 
     # Move the car if it has been repaired
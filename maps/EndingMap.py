@@ -4,6 +4,8 @@
 import arcade
 from constants import *
 from utils.BaseMapView import BaseMapView
+from utils.Backgrounds import background_path
+from utils.BriefingPanel import BriefingPanel
 
 class EndingMap(BaseMapView):
     """ Arrival view: displays 'You Win' message and a restart button """
@@ -11,9 +13,9 @@ class EndingMap(BaseMapView):
     def __init__(self, game_view):
         super().__init__(game_view)
 
-        # Load the background image
-        self.background = arcade.Sprite(
-            "assets/images/backgrounds/kelly_house.png")
+        # Load the background image, resized for the window when available
+        self.background = self.asset_sprite(
+            background_path("assets/images/backgrounds/kelly_house.png"))
 
         # Adjust the scale of the background to fit the screen
         image_width = self.background.width
@@ -40,6 +42,18 @@ class EndingMap(BaseMapView):
         # Create and add the restart button
         self.create_button()
 
+        # Story of the ending, laid out once
+        self.briefing = BriefingPanel("At Killy's home", SCREEN_HEIGHT - 100, [
+            ("Congratulations! You’ve completed the three missions that have tested your resolve, responsibility, and kindness.",
+             SCREEN_HEIGHT - 155, arcade.color.WHITE),
+            ("These three qualities have helped you rediscover and strengthen your friendship.",
+             SCREEN_HEIGHT - 185, arcade.color.WHITE),
+            ("Keep embracing these values, and you will continue to build strong, meaningful relationships that last a lifetime.",
+             SCREEN_HEIGHT - 215, arcade.color.WHITE),
+            ("True friendship is built on trust, shared challenges, and unwavering support for one another.",
+             SCREEN_HEIGHT - 245, arcade.color.WHITE),
+        ], SCREEN_HEIGHT - 150, 230)
+
     def create_button(self):
         """ Create the restart and quit buttons """
         # Create a horizontal box layout
@@ -62,61 +76,22 @@ class EndingMap(BaseMapView):
 
     def on_restart_button_click(self, event):
         """ Handle the restart button click """
-        from utils.GameView import GameView 
-        # Restart the game and go to the Introduction view
-        game_view = GameView()  # Create a new instance of GameView
-        game_view.setup()  # Set up the game state
-        game_view.current_view = 0  # Ensure the introduction view is the first view
-        self.game_view.window.show_view(game_view)
+        # Restart the game and go to the Introduction view, the maps already
+        # built are reset instead of loaded again
+        self.game_view.restart()
 
     def on_quit_button_click(self, event):
         """ Handle the quit button click """
         # Quit the application
         arcade.exit()
     
-    def on_key_release(self, key, modifiers):
-        pass
-
     def on_draw(self):
         """ Draw the arrival scene with the 'You Win' message and restart button """
         # Draw the background
         self.background.draw()
 
-        # Adjust the rectangle to be taller to fit all the text
-        rectangle_height = 230  # Increased to fit all text
-        arcade.draw_rectangle_filled(
-            SCREEN_WIDTH // 2, SCREEN_HEIGHT -
-            150, SCREEN_WIDTH, rectangle_height, arcade.color.BLACK + (200,)
-        )
-
-        # Draw the "At Killy's home" message centered inside the rectangle
-        arcade.draw_text("At Killy's home", SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100,  # Adjusted to be inside the rectangle
-                         arcade.color.GREEN, 24, anchor_x="center", anchor_y="center")
-
-        # Draw each part of the story, ensuring long lines are wrapped within the screen width
-        arcade.draw_text(
-            "Congratulations! You’ve completed the three missions that have tested your resolve, responsibility, and kindness.",
-            40, SCREEN_HEIGHT - 155,  # Adjusted to fit inside the rectangle
-            arcade.color.WHITE, 18, width=SCREEN_WIDTH - 80
-        )
-
-        arcade.draw_text(
-            "These three qualities have helped you rediscover and strengthen your friendship.",
-            40, SCREEN_HEIGHT - 185,  # Adjusted to fit inside the rectangle
-            arcade.color.WHITE, 18, width=SCREEN_WIDTH - 80
-        )
-
-        arcade.draw_text(
-            "Keep embracing these values, and you will continue to build strong, meaningful relationships that last a lifetime.",
-            40, SCREEN_HEIGHT - 215,  # Adjusted to fit inside the rectangle
-            arcade.color.WHITE, 18, width=SCREEN_WIDTH - 80
-        )
-
-        arcade.draw_text(
-            "True friendship is built on trust, shared challenges, and unwavering support for one another.",
-            40, SCREEN_HEIGHT - 245,  # Adjusted to fit inside the rectangle
-            arcade.color.WHITE, 18, width=SCREEN_WIDTH - 80
-        )
+        # Draw the story
+        self.briefing.draw()
 
         # Draw the UI manager (this draws the restart button)
         self.manager.draw()
@@ -1,273 +1,224 @@
 
 import arcade
-import math
 from utils.BaseMapView import BaseMapView
 from utils.tense import Tense
+from utils.TilemapCache import load_tilemap
+from utils.StaticLayerCache import StaticLayerCache
+from utils.TileGrid import TileGrid
+from utils.InteractableRegistry import InteractableRegistry
+from utils.ChaseGroup import ChaseGroup
+from utils.FlowField import FlowField
+from utils.BroadPhase import BroadPhase, sprite_reach
+from utils.BriefingPanel import BriefingPanel
+from utils.InputState import INTERACT, SWITCH_TENSE
 from constants import *
 from utils.GameOverView import GameOverView
 
+MAP_NAME = "assets/maps/forest/test-map.json"
+# Layers that never move, drawn from a baked texture. The bridge only
+# changes their visibility, which gives another texture. The invisibles
+# (the bridge) come after the collectables in the map, so they are drawn
+# with the moving layers to stay above them.
+STATIC_LAYERS = ["background", "blocks", "decorations", "bridge-blocks"]
+# Layers the player can bump into
+WALL_LAYERS = ["blocks", "bridge-blocks", "collectables", "young-dogs", "angry-dogs",
+               "friendly-dogs"]
+# Walls that never move, resolved cell by cell in a tile grid
+GRID_LAYERS = ["blocks", "bridge-blocks"]
+# The other walls move or get collected, they are looked up through a spatial hash
+LAYER_OPTIONS = {name: {"use_spatial_hash": True}
+                 for name in WALL_LAYERS if name not in GRID_LAYERS}
+
 
 class ForestMap(BaseMapView):
+    RESET_ATTRIBUTES = ('wood', 'is_bridge_constructed', 'feeded_dogs', 'tense',
+                        'physics_engine', 'timeline_state')
+    TIMELINE_LAYERS = ('bridge-blocks', 'invisibles', 'young-dogs', 'angry-dogs',
+                       'friendly-dogs', 'dog-food')
+    # is_bridge_constructed, dogs fed
+    PROGRESS_FLAGS = 2
+
     def __init__(self, game_view, game_player_sprite):
         super().__init__(game_view)
         self.game_view = game_view
         self.player_sprite = game_player_sprite
-            # Positionner le joueur correctement dans la nouvelle carte
-        self.player_sprite.center_x = 100  # Ou une autre position de départ logique dans ForestMap
-        self.player_sprite.center_y = 100  # Position de départ
-        self.player_sprite.visible = True
         #print("here goes player", game_player_sprite)
         self.tile_map = None
         self.scene = None
         self.physics_engine = None
         self.mail_sprite = None
         self.dog_food_sprites = arcade.SpriteList()
+        self.static_layers = None
         self.wood = 0
         self.is_bridge_constructed = False
         self.feeded_dogs = 0
         self.tense = Tense.PRESENT
+        # Whether a dog or a bowl moved during the last update
+        self.chasing = False
         self.setup()
+        self.take_snapshot()
+
+        # Story of the mission, laid out once
+        self.briefing = BriefingPanel("Forest Mission", SCREEN_HEIGHT - 125, [
+            ("The dogs attacked, and your friend left because of your carelessness.",
+             SCREEN_HEIGHT - 175, arcade.color.WHITE),
+            ("Now, it’s your chance to fix what you’ve done,you collect the trees to make the bridge,",
+             SCREEN_HEIGHT - 205, arcade.color.YELLOW),
+            ("collect food to feed the dogs, return to the present, collect the letter to complete the activity",
+             SCREEN_HEIGHT - 235, arcade.color.YELLOW),
+        ], SCREEN_HEIGHT - 150, 200)
 
     def setup(self):
-        map_name = "assets/maps/forest/test-map.json"
-        self.tile_map = arcade.load_tilemap(map_name, TILE_SCALING)
+        self.tile_map = load_tilemap(MAP_NAME, TILE_SCALING, LAYER_OPTIONS)
         self.scene = arcade.Scene.from_tilemap(self.tile_map)
+        self.static_layers = StaticLayerCache(self.scene, STATIC_LAYERS)
+        self.tile_grid = TileGrid(self.tile_map, GRID_LAYERS)
 
         mail_source = "assets/maps/forest/letter.png"
-        self.mail_sprite = arcade.Sprite(mail_source, .3)
+        self.mail_sprite = self.asset_sprite(mail_source, scale=.3)
         self.mail_sprite.center_x = 82.5 * TILE_SIZE
         self.mail_sprite.center_y = 38.5 * TILE_SIZE
         self.scene.add_sprite("mail", self.mail_sprite)
         self.mail_sprite.visible = False
 
-        dog_food = "assets/maps/raw/dog-food.png"
+        # The five bowls share the same texture
         actual_tile_size = TILE_SIZE * TILE_SCALING
         for i in range(5):
-            dog_food_sprite = arcade.Sprite(dog_food , .12)
+            dog_food_sprite = self.asset_sprite("assets/maps/raw/dog-food.png", scale=.12)
             dog_food_sprite.center_x = i * 4 * actual_tile_size + (actual_tile_size * 12)
             dog_food_sprite.center_y = actual_tile_size * 5
             self.dog_food_sprites.append(dog_food_sprite)
         self.scene.add_sprite_list(name="dog-food", sprite_list=self.dog_food_sprites)
-        self.scene["dog-food"].visible = False
-
-        # Setup physics engine
-        self.update_walls_in_engine(
-            [self.scene["angry-dogs"], self.scene["collectables"], self.scene["blocks"]])
-
-    def update_walls_in_engine(self, walls):
-        self.physics_engine = arcade.PhysicsEngineSimple(
-            self.player_sprite, walls=walls
-        )
-
-    def near_sprites_in_list_aux(self, sprite_list_1, sprite_list_2, action, radius):
-        for sprite1 in sprite_list_1:
-            for sprite2 in sprite_list_2:
-                distance = math.sqrt((sprite1.center_x - sprite2.center_x) ** 2 +
-                                     (sprite1.center_y - sprite2.center_y) ** 2)
-                if distance < radius:
-                    action(sprite1)
-                    break
-
-    def near_sprites_in_list(self, sprite_list, action):
-        self.near_sprites_in_list_aux(
-            sprite_list, [self.player_sprite], action, COLLECTING_DISTANCE)
+
+        # Visible layers and physics engine of every tense and step of the puzzle
+        self.build_timeline()
+
+        # Dogs and bowls following the player, moved with numpy. The dogs go
+        # around the trees along the paths to the player.
+        self.flow_field = FlowField(self.tile_grid, ["blocks"], FLOW_FIELD_WORKER)
+        self.dogs = ChaseGroup(self.scene["angry-dogs"], CHASING_DISTANCE, CHASING_SPEED,
+                               self.flow_field)
+        self.bowls = ChaseGroup(self.scene["dog-food"], TILE_SIZE * TILE_SCALING * 2,
+                                PLAYER_SPEED * 2)
+
+        # Game over checks between the player and the dogs
+        self.broad_phase = BroadPhase()
+        self.dog_reach = sprite_reach(self.dogs.sprites)
+
+        # What ENTER can be used on, looked up around the tile of the player.
+        # The bowls follow the player, they are checked against the dogs instead.
+        self.interactables = InteractableRegistry(TILE_SIZE * TILE_SCALING)
+        self.interactables.register(self.scene["invisibles"], self.display_invisibles,
+                                    COLLECTING_DISTANCE, Tense.PAST)
+        # One press collects every other wood tile in reach, as it always did
+        self.interactables.register(self.scene["collectables"], self.collect_wood,
+                                    COLLECTING_DISTANCE, skip_after_remove=True)
+
+    def describe_timeline(self, tense, is_bridge_constructed, dogs_fed):
+        if tense == Tense.PAST:
+            # The young dogs wait for their food on the other side of the river
+            if is_bridge_constructed:
+                return (["invisibles", "young-dogs", "dog-food"],
+                        ["young-dogs", "collectables", "blocks"])
+            return (["bridge-blocks", "young-dogs"],
+                    ["young-dogs", "collectables", "blocks", "bridge-blocks"])
+
+        # In the present the dogs are friendly only if they were fed in the past.
+        # The bridge blocks only belong to the past, hidden from the first frame
+        # on (they used to be drawn over the invisibles until the first switch).
+        dogs = "friendly-dogs" if dogs_fed else "angry-dogs"
+        return ["invisibles", dogs], [dogs, "collectables", "blocks"]
+
+    def timeline_key(self):
+        return self.tense, self.is_bridge_constructed, self.feeded_dogs >= 4
+
+    def game_over_candidates(self):
+        """ Sprites, positions and reach of the enemies of the current tense, or None """
+        # The dogs only bite in the present
+        if self.tense == Tense.PRESENT:
+            return self.dogs.sprites, self.dogs.positions, self.dog_reach
+        return None
 
     def check_player_dogs_collision(self):
-        present_monsters = self.scene["angry-dogs"]
-        present_collisions = arcade.check_for_collision_with_list(self.player_sprite, present_monsters)
-        if self.tense == Tense.PRESENT and present_collisions :
+        self.broad_phase.next_frame()
+        # Only the dogs near the player are tested
+        candidates = self.game_over_candidates()
+        if candidates and self.broad_phase.collides(self.player_sprite, *candidates):
             #print("Game Over")
             game_over_view = GameOverView(self.game_view)  # Crée une instance de la vue "Game Over"
             self.game_view.window.show_view(
                             game_over_view) 
     def collect_wood(self, collectable):
         self.scene["collectables"].remove(collectable)
+        self.interactables.remove(collectable)
         self.wood += 1
 
     def display_invisibles(self, invisibles):
         if self.wood > 3 and self.tense == Tense.PAST:
-            self.scene["invisibles"].visible = True
-            self.scene["dog-food"].visible = True
-            self.update_walls_in_engine(
-                [self.scene["young-dogs"], self.scene["collectables"], self.scene["blocks"]])
             self.is_bridge_constructed = True
-
-    def chase_player(self, sprite, speed):
-        x_diff = self.player_sprite.center_x - sprite.center_x
-        y_diff = self.player_sprite.center_y - sprite.center_y
-        distance = math.sqrt(x_diff ** 2 + y_diff ** 2)
-        if distance < 0.01:
-            return  # Avoid division by zero
-
-        sprite.center_x += (x_diff / distance) * speed
-        sprite.center_y += (y_diff / distance) * speed
+            self.apply_timeline()
 
     def chase_by_dogs(self):
         if self.tense == Tense.PRESENT and self.feeded_dogs < 4:
-            self.scene["angry-dogs"].visible = True
-            self.scene["friendly-dogs"].visible = False
-            for dog in self.scene["angry-dogs"]:
-                distance = math.sqrt((dog.center_x - self.player_sprite.center_x) ** 2 +
-                                     (dog.center_y - self.player_sprite.center_y) ** 2)
-                if distance < CHASING_DISTANCE:  # Check if the dog is near the player
-                    # Make the dog chase the player
-                    self.chase_player(dog, CHASING_SPEED)
+            # The dogs near the player run at it, all in one step
+            if self.dogs.update(self.player_sprite.center_x, self.player_sprite.center_y):
+                self.chasing = True
 
     def chase_by_dog_food(self):
-        for food in self.scene["dog-food"]:
-            distance = math.sqrt((food.center_x - self.player_sprite.center_x) ** 2 +
-                                 (food.center_y - self.player_sprite.center_y) ** 2)
-            if distance < TILE_SIZE * TILE_SCALING * 2:
-                self.chase_player(food, PLAYER_SPEED * 2)
+        if self.bowls.update(self.player_sprite.center_x, self.player_sprite.center_y):
+            self.chasing = True
 
     def feed_dog(self, dog_food_sprite):
         #print("dogs are feeded")
         self.feeded_dogs += 1
         self.scene["dog-food"].remove(dog_food_sprite)
+        self.bowls.sync()
         if (self.feeded_dogs >= 4):
             self.mail_sprite.visible = True
+            self.apply_timeline()
 
     def switch_tense(self):
-        if self.tense == Tense.PRESENT:
-            if not self.is_bridge_constructed:
-                self.scene["invisibles"].visible = False
-                self.scene["bridge-blocks"].visible = True
-                self.update_walls_in_engine(
-                    [self.scene["young-dogs"], self.scene["collectables"], self.scene["blocks"], self.scene["bridge-blocks"]])
-            else:
-                self.scene["invisibles"].visible = True
-                self.scene["bridge-blocks"].visible = False
-                self.update_walls_in_engine(
-                    [self.scene["young-dogs"], self.scene["collectables"], self.scene["blocks"]])
-
-            self.scene["angry-dogs"].visible = False
-            self.scene["friendly-dogs"].visible = False
-            self.scene["young-dogs"].visible = True
-            self.scene["dog-food"].visible = True if self.is_bridge_constructed else False
-
-            self.tense = Tense.PAST
-
-        else:
-            self.scene["invisibles"].visible = True
-            self.scene["bridge-blocks"].visible = False
-
-            if self.feeded_dogs >= 4:
-                self.scene["angry-dogs"].visible = False
-                self.scene["friendly-dogs"].visible = True
-                self.update_walls_in_engine(
-                    [self.scene["friendly-dogs"], self.scene["collectables"], self.scene["blocks"]])
-            else:
-                self.scene["angry-dogs"].visible = True
-                self.scene["friendly-dogs"].visible = False
-                self.update_walls_in_engine(
-                    [self.scene["angry-dogs"], self.scene["collectables"], self.scene["blocks"]])
-
-            self.scene["young-dogs"].visible = False
-            self.scene["dog-food"].visible = False
-
-            self.tense = Tense.PRESENT
+        self.tense = Tense.PAST if self.tense == Tense.PRESENT else Tense.PRESENT
+        self.apply_timeline()
 
     def on_draw(self):
         # pass
         arcade.start_render()
-        self.scene.draw()
-
-       # Si on est dans le passé, dessiner un rectangle gris transparent
-        if self.tense == Tense.PAST:
-            # Rectangle gris transparent sur tout l'écran
-            arcade.draw_rectangle_filled(
-                SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2,  # Position au centre de l'écran
-                SCREEN_WIDTH, SCREEN_HEIGHT,  # Taille du rectangle pour couvrir tout l'écran
-                # Couleur grise avec une transparence (alpha = 150 sur 255)
-                (*arcade.color.GRAY, 150)
-            )
-
-            # Effet vignette : Rectangle noir transparent en bas
-            arcade.draw_rectangle_filled(
-                SCREEN_WIDTH // 2, 0,  # Position au bas de l'écran
-                SCREEN_WIDTH, 50,  # Largeur complète, hauteur réduite pour l'effet
-                arcade.color.BLACK
-            )
-
-            # Effet vignette : Rectangle noir transparent à gauche
-            arcade.draw_rectangle_filled(
-                0, SCREEN_HEIGHT // 2,  # Position à gauche de l'écran
-                50, SCREEN_HEIGHT,  # Largeur réduite, hauteur complète
-                arcade.color.BLACK
-            )
-
-            # Effet vignette : Rectangle noir transparent à droite
-            arcade.draw_rectangle_filled(
-                SCREEN_WIDTH, SCREEN_HEIGHT // 2,  # Position à droite de l'écran
-                50, SCREEN_HEIGHT,  # Largeur réduite, hauteur complète
-                arcade.color.BLACK
-            )
+        self.draw_scene()
 
         if self.mail_sprite.visible == True:
             arcade.draw_text("Congrats ! you kept your promise.", TILE_SIZE *
                              TILE_SCALING*53, TILE_SIZE*TILE_SCALING*35, arcade.color.BLACK, 15)
 
-        # Check if the player will be out of bounds
+        # Show the mission while the player is low enough not to be hidden by it
         if self.player_sprite.center_y < SCREEN_HEIGHT-300:
+            self.briefing.draw()
 
-            rectangle_height = 200  # Increased to fit all text
-            arcade.draw_rectangle_filled(
-                SCREEN_WIDTH // 2, SCREEN_HEIGHT -
-                150, SCREEN_WIDTH, rectangle_height, arcade.color.BLACK +
-                (200,)
-            )
-
-            # Draw the "At Killy's home" message centered inside the rectangle
-            arcade.draw_text("Forest Mission", SCREEN_WIDTH // 2, SCREEN_HEIGHT - 125,  # Adjusted to be inside the rectangle
-                             arcade.color.GREEN, 24, anchor_x="center", anchor_y="center")
-
-            # Draw each part of the story, ensuring long lines are wrapped within the screen width
-            arcade.draw_text(
-                "The dogs attacked, and your friend left because of your carelessness.",
-                40, SCREEN_HEIGHT - 175,  # Adjusted to fit inside the rectangle
-                arcade.color.WHITE, 18, width=SCREEN_WIDTH - 80
-            )
-
-            arcade.draw_text(
-                "Now, it’s your chance to fix what you’ve done,you collect the trees to make the bridge,",
-                40, SCREEN_HEIGHT - 205,  # Adjusted to fit inside the rectangle
-                arcade.color.YELLOW, 18, width=SCREEN_WIDTH - 80
-            )
-
-            arcade.draw_text(
-                "collect food to feed the dogs, return to the present, collect the letter to complete the activity",
-                40, SCREEN_HEIGHT - 235,  # Adjusted to fit inside the rectangle
-                arcade.color.YELLOW, 18, width=SCREEN_WIDTH - 80
-            )
-
-    def on_key_press(self, key, modifiers):
-        if key == arcade.key.UP:
-            self.player_sprite.change_y = PLAYER_SPEED
-        elif key == arcade.key.DOWN:
-            self.player_sprite.change_y = -PLAYER_SPEED
-        elif key == arcade.key.LEFT:
-            self.player_sprite.change_x = -PLAYER_SPEED
-        elif key == arcade.key.RIGHT:
-            self.player_sprite.change_x = PLAYER_SPEED
-        elif key == arcade.key.ENTER:
-            self.near_sprites_in_list(
-                self.scene["invisibles"], self.display_invisibles)
-            self.near_sprites_in_list(
-                self.scene["collectables"], self.collect_wood)
+    def on_action(self, action):
+        if action == INTERACT:
+            self.interact()
             self.near_sprites_in_list_aux(
                 self.scene["dog-food"], self.scene["young-dogs"], self.feed_dog, COLLECTING_DISTANCE*3)
-        elif key == arcade.key.SPACE:
+        elif action == SWITCH_TENSE:
             self.switch_tense()
 
-    def on_key_release(self, key, modifiers):
-        if key == arcade.key.UP or key == arcade.key.DOWN:
-            self.player_sprite.change_y = 0
-        elif key == arcade.key.LEFT or key == arcade.key.RIGHT:
-            self.player_sprite.change_x = 0
+    def reset(self):
+        super().reset()
+        # The dogs and the bowls are back at their place
+        self.dogs.sync()
+        self.bowls.sync()
+        self.flow_field.reset()
+
+    def is_active(self):
+        return self.chasing
+
+    def moving_sprites(self):
+        return self.dogs.sprites + self.bowls.sprites
 
     def on_update(self, delta_time):
         """ Update logic for chasing dogs and checking for game over condition. """
         # Mettre à jour la logique de poursuite des chiens
+        self.chasing = False
         self.chase_by_dogs()
         self.chase_by_dog_food()
         self.check_player_dogs_collision()
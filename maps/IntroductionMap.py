@@ -1,6 +1,8 @@
 import arcade
 from constants import *
 from utils.BaseMapView import BaseMapView
+from utils.Backgrounds import background_path
+from utils.BriefingPanel import BriefingPanel
 
 
 class IntroductionMap(BaseMapView):
@@ -8,9 +10,9 @@ class IntroductionMap(BaseMapView):
 
     def __init__(self, game_view):
         super().__init__(game_view)
-        # Load the background image
-        self.background = arcade.Sprite(
-            "assets/images/backgrounds/house_map_present.png")
+        # Load the background image, resized for the window when available
+        self.background = self.asset_sprite(
+            background_path("assets/images/backgrounds/house_map_present.png"))
 
         # Adjust the scale of the background to fit the screen
         image_width = self.background.width
@@ -39,71 +41,50 @@ class IntroductionMap(BaseMapView):
         # Set up the button click event
         self.lets_go_button.on_click = self.on_lets_go_click
 
+        # Introduction text, laid out once
+        self.briefing = BriefingPanel("At home", SCREEN_HEIGHT - 80, [
+            ("Arrrrffff ! You and Kelly are fighting because you broke her favorite paint palette and got paint all over the floor....",
+             SCREEN_HEIGHT - 120, arcade.color.WHITE),
+            ("She's so mad that she's left the house and you're not sure where she's gone.",
+             SCREEN_HEIGHT - 150, arcade.color.WHITE),
+            ("You need to find her and apologize before she gets too far away.",
+             SCREEN_HEIGHT - 180, arcade.color.WHITE),
+            ("But to make things right, you’ll have to complete three missions.",
+             SCREEN_HEIGHT - 210, arcade.color.WHITE),
+            ("For each one, you’ll need to go back in time, fix your mistakes, and repair the present.",
+             SCREEN_HEIGHT - 240, arcade.color.YELLOW),
+        ], SCREEN_HEIGHT - 150, 200, panel_width=SCREEN_WIDTH - 20, text_x=20)
+
     def on_lets_go_click(self, event):
         """Switch to the next map when the button is clicked."""
-        # Stop the introduction music
-        if self.game_view.current_music_player:
-            arcade.stop_sound(self.game_view.current_music_player)
-
-        # Play the present music
-        self.game_view.change_music(self.game_view.present_music)
+        # Stop the introduction music and play the present and past musics
+        self.game_view.start_timeline_music()
 
         # reset player position to left edge
         self.game_view.player_sprite.center_x = PLAYER_BORDER_PADDING + 60
         self.game_view.player_sprite.center_y = SCREEN_HEIGHT // 2 - 120
 
-        self.game_view.current_view = (
-            self.game_view.current_view + 1) % len(self.game_view.views)
+        self.game_view.show_map(
+            (self.game_view.current_view + 1) % len(self.game_view.views))
 
         # remove the button
         self.manager.disable()
 
+    def reset(self):
+        """ Show the "Let's go" button again """
+        self.manager.enable()
+
     def on_draw(self):
         """ Draw the map. """
         # Draw the background
         self.background.draw()
 
-        # Draw a semi-transparent background box for the text
-        arcade.draw_rectangle_filled(
-            SCREEN_WIDTH // 2, SCREEN_HEIGHT - 150, SCREEN_WIDTH - 20, 200, arcade.color.BLACK + (200,))
-
-        arcade.draw_text("At home", SCREEN_WIDTH // 2, SCREEN_HEIGHT - 80,  # Adjusted to be inside the rectangle
-                         arcade.color.GREEN, 24, anchor_x="center", anchor_y="center")
-
         # Draw the introduction text
-        arcade.draw_text(
-            "Arrrrffff ! You and Kelly are fighting because you broke her favorite paint palette and got paint all over the floor....",
-            20, SCREEN_HEIGHT - 120, arcade.color.WHITE, 18, width=SCREEN_WIDTH - 40
-        )
-        arcade.draw_text(
-            "She's so mad that she's left the house and you're not sure where she's gone.",
-            20, SCREEN_HEIGHT - 150, arcade.color.WHITE, 18, width=SCREEN_WIDTH - 40
-        )
-        arcade.draw_text(
-            "You need to find her and apologize before she gets too far away.",
-            20, SCREEN_HEIGHT - 180, arcade.color.WHITE, 18, width=SCREEN_WIDTH - 40
-        )
-        arcade.draw_text(
-            "But to make things right, you’ll have to complete three missions.",
-            20,SCREEN_HEIGHT - 210, arcade.color.WHITE, 18, width=SCREEN_WIDTH - 40,
-        )
-
-        arcade.draw_text(
-            "For each one, you’ll need to go back in time, fix your mistakes, and repair the present.",
-            20,SCREEN_HEIGHT - 240, arcade.color.YELLOW, 18, width=SCREEN_WIDTH - 40,
-        )
+        self.briefing.draw()
 
         # Draw the button
         self.manager.draw()
 
-    def on_key_press(self, key, modifiers):
-        """ Disable key press during the introduction """
-        pass
-
-    def on_key_release(self, key, modifiers):
-        """ Disable key release during the introduction """
-        pass
-
     def on_hide_view(self):
         """ Disable the manager when switching to another view """
         self.manager.disable()
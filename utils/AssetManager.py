@@ -0,0 +1,179 @@
+from collections import OrderedDict
+
+import arcade
+import PIL.Image
+from arcade.resources import resolve_resource_path
+
+from constants import ASSET_MEMORY_BUDGET
+from utils.Music import Music
+
+
+class AssetEntry:
+    """ One loaded asset with its reference count and its size in memory """
+
+    def __init__(self, asset, size):
+        self.asset = asset
+        self.size = size
+        self.refs = 0
+
+
+class AssetManager:
+    """
+    Single place where the textures, sounds and musics of the game are loaded.
+
+    Assets are deduplicated by path and loading parameters. Every load adds a
+    reference that is given back with release(); assets nobody references
+    stay cached and are evicted, least recently used first, once the memory
+    budget is exceeded.
+    """
+
+    def __init__(self, memory_budget=ASSET_MEMORY_BUDGET):
+        self.memory_budget = memory_budget
+        # Least recently used entries come first
+        self.entries = OrderedDict()
+        self.keys_by_asset = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_resident = 0
+
+    def load_texture(self, path, flipped_horizontally=False,
+                     flipped_vertically=False, hit_box_algorithm="Simple"):
+        """ Return the texture of an image file, loading it if needed """
+        key = self.texture_key(path, flipped_horizontally, flipped_vertically,
+                               hit_box_algorithm)
+        return self.acquire(key, lambda: self.create_texture(*key[1:]))
+
+    def load_texture_pair(self, path):
+        """ Return a texture and its mirror image """
+        return [
+            self.load_texture(path),
+            self.load_texture(path, flipped_horizontally=True),
+        ]
+
+    def load_sound(self, path):
+        """ Return a fully decoded sound (short effects), loading it if needed """
+        key = ("sound", str(path))
+        return self.acquire(key, lambda: self.create_sound(key[1]))
+
+    def load_music(self, path):
+        """ Return a music streamed from disk while it plays """
+        key = self.music_key(path)
+        # Nothing is decoded before the music is played
+        return self.acquire(key, lambda: (Music(key[1]), 0))
+
+    def preload(self, key, asset, size):
+        """
+        Add an asset prepared outside of the manager (by the loading screen)
+        without taking a reference on it.
+        """
+        if key in self.entries:
+            return
+        self.entries[key] = AssetEntry(asset, size)
+        self.keys_by_asset[id(asset)] = key
+        self.bytes_resident += size
+        self.evict()
+
+    def release(self, asset):
+        """ Give back a reference taken by one of the load methods """
+        key = self.keys_by_asset.get(id(asset))
+        if key is None:
+            return
+        entry = self.entries[key]
+        entry.refs = max(0, entry.refs - 1)
+        self.evict()
+
+    def set_memory_budget(self, memory_budget):
+        self.memory_budget = memory_budget
+        self.evict()
+
+    def stats(self):
+        """ Return the counters of the cache """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "referenced": sum(1 for entry in self.entries.values() if entry.refs),
+            "bytes_resident": self.bytes_resident,
+            "memory_budget": self.memory_budget,
+        }
+
+    def acquire(self, key, create):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            asset, size = create()
+            entry = AssetEntry(asset, size)
+            self.entries[key] = entry
+            self.keys_by_asset[id(asset)] = key
+            self.bytes_resident += size
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        entry.refs += 1
+        self.evict()
+        return entry.asset
+
+    def evict(self):
+        """ Drop unreferenced assets, oldest first, until the budget is met """
+        if self.bytes_resident <= self.memory_budget:
+            return
+        for key in list(self.entries):
+            if self.bytes_resident <= self.memory_budget:
+                break
+            entry = self.entries[key]
+            if entry.refs > 0:
+                continue
+            del self.entries[key]
+            del self.keys_by_asset[id(entry.asset)]
+            self.bytes_resident -= entry.size
+            self.evictions += 1
+            if isinstance(entry.asset, arcade.Texture):
+                self.remove_from_atlas(entry.asset)
+
+    @staticmethod
+    def texture_key(path, flipped_horizontally=False, flipped_vertically=False,
+                    hit_box_algorithm="Simple"):
+        return ("texture", str(path), flipped_horizontally, flipped_vertically,
+                hit_box_algorithm)
+
+    @staticmethod
+    def music_key(path):
+        return ("music", str(path))
+
+    @staticmethod
+    def create_texture(path, flipped_horizontally, flipped_vertically, hit_box_algorithm):
+        image = PIL.Image.open(resolve_resource_path(path)).convert("RGBA")
+        if flipped_horizontally:
+            image = image.transpose(PIL.Image.FLIP_LEFT_RIGHT)
+        if flipped_vertically:
+            image = image.transpose(PIL.Image.FLIP_TOP_BOTTOM)
+        name = f"{path}-{flipped_horizontally}-{flipped_vertically}-{hit_box_algorithm}"
+        texture = arcade.Texture(name, image, hit_box_algorithm=hit_box_algorithm)
+        return texture, image.width * image.height * 4
+
+    @staticmethod
+    def create_sound(path):
+        sound = arcade.load_sound(path)
+        # Size of the decoded PCM data, from its format and duration
+        audio_format = sound.source.audio_format
+        if audio_format is None or not sound.source.duration:
+            return sound, 0
+        size = (sound.source.duration * audio_format.sample_rate
+                * audio_format.channels * audio_format.sample_size // 8)
+        return sound, int(size)
+
+    @staticmethod
+    def remove_from_atlas(texture):
+        """ Free the space of an evicted texture in the GPU atlas """
+        try:
+            atlas = arcade.get_window().ctx.default_atlas
+        except Exception:
+            return
+        if atlas.has_texture(texture):
+            atlas.remove(texture)
+
+
+# Asset manager shared by the whole game
+asset_manager = AssetManager()
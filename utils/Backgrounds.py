@@ -0,0 +1,70 @@
+import os
+
+import PIL.Image
+
+from constants import *
+
+# Folder of the resized backgrounds written by bin/build_backgrounds.py
+SCALED_DIRECTORY = "assets/images/backgrounds/scaled"
+
+# Full-screen images and how they are fitted to the window:
+# "cover" keeps the ratio and fills the window, "stretch" fills it exactly
+BACKGROUNDS = [
+    ("assets/images/backgrounds/house_map_present.png", "cover"),
+    ("assets/images/backgrounds/kelly_house.png", "cover"),
+    ("assets/images/backgrounds/game_over.jpg", "stretch"),
+]
+
+# Window sizes a variant is built for: only the one the game opens, the
+# variants of other sizes would never be loaded
+VARIANT_SIZES = [(SCREEN_WIDTH, SCREEN_HEIGHT)]
+
+
+def fitted_size(image_size, window_size, mode):
+    """ Size at which an image is drawn in a window of the given size """
+    if mode == "stretch":
+        return window_size
+    scale = max(window_size[0] / image_size[0], window_size[1] / image_size[1])
+    return round(image_size[0] * scale), round(image_size[1] * scale)
+
+
+def variant_path(path, width, height):
+    name, extension = os.path.splitext(os.path.basename(path))
+    return os.path.join(SCALED_DIRECTORY, f"{name}_{width}x{height}{extension}")
+
+
+def build_variant(path, mode, width, height):
+    """
+    Write the variant of a background for a window size. Returns its path,
+    or None when the source is not bigger than what is drawn (no gain).
+    """
+    image = PIL.Image.open(path)
+    size = fitted_size(image.size, (width, height), mode)
+    if size[0] >= image.width and size[1] >= image.height:
+        return None
+    os.makedirs(SCALED_DIRECTORY, exist_ok=True)
+    output = variant_path(path, width, height)
+    source = image.convert("RGBA") if image.mode == "P" else image
+    resized = source.resize(size, PIL.Image.LANCZOS)
+    if image.mode == "P":
+        # Keep palette images small on disk
+        resized = resized.quantize(256)
+    resized.save(output, quality=90, optimize=True)
+    return output
+
+
+def background_path(path, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+    """
+    Return the file to load for a background shown in a window of the given
+    size: the smallest variant built for a window at least as big, or the
+    source image when there is none.
+    """
+    candidates = [
+        (variant_width * variant_height, variant_path(path, variant_width, variant_height))
+        for variant_width, variant_height in VARIANT_SIZES
+        if variant_width >= width and variant_height >= height
+    ]
+    for _, candidate in sorted(candidates):
+        if os.path.exists(candidate):
+            return candidate
+    return path
@@ -1,12 +1,198 @@
+import arcade
+
+from utils.AssetManager import asset_manager
+from utils.GridPhysicsEngine import GridPhysicsEngine
+from utils.Proximity import near_sprites
+from utils.TimelineState import TimelineState, timeline_keys
+from utils.tense import Tense
+
+
 class BaseMapView:
     """ Base class for all map views """
 
+    # Attributes restored by reset(), listed by each map
+    RESET_ATTRIBUTES = ()
+    # Layers whose visibility depends on the tense and the puzzle
+    TIMELINE_LAYERS = ()
+    # Number of progress flags returned by timeline_key() after the tense
+    PROGRESS_FLAGS = 0
+    scene = None
+    snapshot = None
+    timeline = None
+    timeline_state = None
+    physics_engine = None
+    physics_engines = None
+    # Occupancy of the wall layers that never move, see TileGrid
+    tile_grid = None
+    # What the player can use with ENTER, see InteractableRegistry
+    interactables = None
+
     def __init__(self, game_view):
         self.game_view = game_view  # Reference to the GameView
         self.player_sprite = game_view.player_sprite
+        self.init_assets()
+
+    def init_assets(self):
+        # Sprites whose texture comes from the asset manager, with its path
+        self.asset_sprites = []
+        # Textures referenced in the asset manager, none while the player is elsewhere
+        self.asset_textures = []
+        self.assets_held = True
+
+    def asset_sprite(self, path, **kwargs):
+        """ Sprite with a texture of the asset manager, held while the player is in the map """
+        texture = asset_manager.load_texture(path)
+        self.asset_sprites.append((path, arcade.Sprite(texture=texture, **kwargs)))
+        self.asset_textures.append(texture)
+        return self.asset_sprites[-1][1]
+
+    def release_assets(self):
+        """ The player left the map: its textures may be evicted from the cache """
+        if not self.assets_held:
+            return
+        for texture in self.asset_textures:
+            asset_manager.release(texture)
+        self.asset_textures = []
+        self.assets_held = False
+
+    def acquire_assets(self):
+        """ The player enters the map: take its textures back, reloading the evicted ones """
+        if self.assets_held:
+            return
+        for path, sprite in self.asset_sprites:
+            self.asset_textures.append(asset_manager.load_texture(path))
+            # An evicted texture left the GPU atlas, put it back (same name, same image)
+            for sprite_list in sprite.sprite_lists:
+                sprite_list.update_texture(sprite)
+        self.assets_held = True
 
     def on_draw(self):
         pass
 
+    def draw_scene(self):
+        """ Draw the tile layers of the map, with the look of its tense """
+        self.game_view.past_effect.draw(self.static_layers.draw, self.tense)
+
     def on_update(self, delta_time):
-        pass
\ No newline at end of file
+        pass
+
+    def is_active(self):
+        """ Whether something moves on the map without the player (enemies...) """
+        return False
+
+    def on_action(self, action):
+        """ Action of a key pressed (see InputState), run at the start of a tick """
+        pass
+
+    def on_direction(self, direction_x, direction_y):
+        """ Held arrow keys, once the player was set walking that way """
+        pass
+
+    def moving_sprites(self):
+        """ Sprites moved by the map itself, drawn between two ticks """
+        return []
+
+    def interact(self):
+        """ ENTER: use the interactables around the player """
+        if self.interactables is not None:
+            self.interactables.interact(self.player_sprite.center_x,
+                                        self.player_sprite.center_y, self.tense)
+
+    def near_sprites_in_list_aux(self, sprite_list_1, sprite_list_2, action, radius):
+        """ Call action on each sprite of sprite_list_1 closer than radius to one of sprite_list_2 """
+        near = set(near_sprites(sprite_list_1, sprite_list_2, radius))
+        # Same walk as a for loop over the live list, so the actions removing
+        # their sprite (collect, feed...) reach the same sprites as before
+        index = 0
+        while index < len(sprite_list_1):
+            sprite = sprite_list_1[index]
+            index += 1
+            if sprite in near:
+                action(sprite)
+
+    def get_physics_engine(self, walls):
+        """
+        Physics engine keeping the player out of the given layers. The layers
+        of the tile grid are resolved cell by cell, the others sprite by
+        sprite. The states sharing the same walls share the same engine.
+        """
+        walls = tuple(walls)
+        if self.physics_engines is None:
+            self.physics_engines = {}
+        engine = self.physics_engines.get(walls)
+        if engine is None:
+            if self.tile_grid is None:
+                engine = arcade.PhysicsEngineSimple(
+                    self.player_sprite, walls=[self.scene[name] for name in walls])
+            else:
+                grid_layers = [name for name in walls if name in self.tile_grid.bits]
+                sprite_walls = [self.scene[name] for name in walls
+                                if name not in self.tile_grid.bits]
+                engine = GridPhysicsEngine(self.player_sprite, self.tile_grid,
+                                           grid_layers, sprite_walls)
+            self.physics_engines[walls] = engine
+        return engine
+
+    def describe_timeline(self, tense, *progress):
+        """
+        Return the names of the visible layers (among TIMELINE_LAYERS) and of
+        the wall layers for a tense and values of the progress flags. By
+        default the map looks the same in both tenses and has no walls.
+        """
+        return self.TIMELINE_LAYERS, ()
+
+    def timeline_key(self):
+        """ Current tense followed by the current progress flags """
+        # Maps without a tense always show their state of the present
+        return (Tense.PRESENT,)
+
+    def build_timeline(self):
+        """ Build the state of every combination of tense and progress flags """
+        self.timeline = {}
+        for key in timeline_keys(self.PROGRESS_FLAGS):
+            visible_layers, walls = self.describe_timeline(*key)
+            self.timeline[key] = TimelineState(
+                self.scene, self.TIMELINE_LAYERS, visible_layers, walls,
+                self.get_physics_engine(walls))
+        self.apply_timeline()
+
+    def apply_timeline(self):
+        """ Switch to the state of the current tense and progress """
+        state = self.timeline[self.timeline_key()]
+        if state is self.timeline_state:
+            return
+        self.timeline_state = state
+        state.apply()
+        self.physics_engine = state.physics_engine
+
+    def take_snapshot(self):
+        """ Remember the state of the map right after it was loaded """
+        layers = []
+        if self.scene is not None:
+            for sprite_list in self.scene.sprite_lists:
+                sprites = [(sprite, sprite.position, sprite.visible)
+                           for sprite in sprite_list]
+                layers.append((sprite_list, sprite_list.visible, sprites))
+        self.snapshot = {
+            "attributes": {name: getattr(self, name) for name in self.RESET_ATTRIBUTES},
+            "layers": layers,
+        }
+
+    def reset(self):
+        """ Put the map back in its initial state without loading anything """
+        if self.snapshot is None:
+            return
+        for name, value in self.snapshot["attributes"].items():
+            setattr(self, name, value)
+        if self.interactables is not None:
+            self.interactables.reset()
+        for sprite_list, visible, sprites in self.snapshot["layers"]:
+            sprite_list.visible = visible
+            # Collected items were removed from their list, put them back in
+            # their place, the order of a layer is the order of its actions
+            if any(sprite_list not in sprite.sprite_lists for sprite, _, _ in sprites):
+                sprite_list.clear()
+                sprite_list.extend([sprite for sprite, _, _ in sprites])
+            for sprite, position, sprite_visible in sprites:
+                sprite.position = position
+                sprite.visible = sprite_visible
@@ -0,0 +1,47 @@
+import arcade
+import pyglet
+
+from constants import *
+
+
+class BriefingPanel:
+    """
+    Story of a map shown in a dark box at the top of the screen. The title
+    and the lines are laid out once, with the box, in a pyglet batch, so
+    showing the panel is a single draw call.
+    """
+
+    def __init__(self, title, title_y, lines, panel_y, panel_height,
+                 panel_width=SCREEN_WIDTH, text_x=40):
+        """
+        lines is a list of (text, y, color). The box is centered on
+        panel_y and the lines start at text_x, with the same margin on the
+        right.
+        """
+        self.batch = pyglet.graphics.Batch()
+        background = pyglet.graphics.Group(order=0)
+        foreground = pyglet.graphics.Group(order=1)
+
+        self.background = pyglet.shapes.Rectangle(
+            (SCREEN_WIDTH - panel_width) / 2, panel_y - panel_height / 2,
+            panel_width, panel_height, color=(0, 0, 0, 200),
+            batch=self.batch, group=background)
+
+        self.title = pyglet.text.Label(
+            title, font_name=FONT_NAME, font_size=24,
+            color=arcade.get_four_byte_color(arcade.color.GREEN),
+            x=SCREEN_WIDTH // 2, y=title_y, anchor_x="center", anchor_y="center",
+            batch=self.batch, group=foreground)
+
+        self.lines = [
+            pyglet.text.Label(
+                text, font_name=FONT_NAME, font_size=18,
+                color=arcade.get_four_byte_color(color),
+                x=text_x, y=y, width=SCREEN_WIDTH - 2 * text_x,
+                batch=self.batch, group=foreground)
+            for text, y, color in lines
+        ]
+
+    def draw(self):
+        with arcade.get_window().ctx.pyglet_rendering():
+            self.batch.draw()
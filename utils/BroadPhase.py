@@ -0,0 +1,54 @@
+import arcade
+import numpy as np
+
+
+def sprite_reach(sprites):
+    """ Largest distance from the center to the edge of the hit boxes of some sprites """
+    reach = 0.0
+    for sprite in sprites:
+        x, y = sprite.position
+        reach = max(reach, x - sprite.left, sprite.right - x, y - sprite.bottom, sprite.top - y)
+    return reach
+
+
+class BroadPhase:
+    """
+    Broad phase between the player and the moving enemies of a map.
+
+    The numpy positions their group already keeps are tested all at once
+    against the box of the player, grown by the reach of the enemies: a
+    single vectorized pass, still going over every enemy each frame (there
+    are only a few of them). Only the enemies inside get the exact arcade
+    test. The exact tests are counted, frame by frame, to see what is saved.
+    """
+
+    def __init__(self):
+        # Exact tests of the current frame and of the previous one
+        self.narrow_tests = 0
+        self.narrow_tests_per_frame = 0
+        self.total_narrow_tests = 0
+        self.frames = 0
+
+    def next_frame(self):
+        self.narrow_tests_per_frame = self.narrow_tests
+        self.narrow_tests = 0
+        self.frames += 1
+
+    def candidates(self, sprite, positions, reach):
+        """ Indices of the positions close enough to the hit box of the sprite """
+        if len(positions) == 0:
+            return []
+        inside = ((positions[:, 0] >= sprite.left - reach)
+                  & (positions[:, 0] <= sprite.right + reach)
+                  & (positions[:, 1] >= sprite.bottom - reach)
+                  & (positions[:, 1] <= sprite.top + reach))
+        return np.flatnonzero(inside).tolist()
+
+    def collides(self, sprite, sprites, positions, reach):
+        """ Whether sprite touches one of sprites, whose centers are positions """
+        for index in self.candidates(sprite, positions, reach):
+            self.narrow_tests += 1
+            self.total_narrow_tests += 1
+            if arcade.check_for_collision(sprite, sprites[index]):
+                return True
+        return False
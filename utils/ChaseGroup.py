@@ -0,0 +1,59 @@
+import numpy as np
+
+from utils.Proximity import sprite_positions
+
+
+class ChaseGroup:
+    """
+    Sprites walking straight at a target once it is closer than radius
+    (dogs, bowls of food...). Their positions are kept in a numpy array and
+    moved together in one step per frame. Only the sprites that moved are
+    written back.
+
+    With a FlowField, the sprites walk around the walls along the field
+    instead of straight at the target.
+
+    The group owns the positions of its sprites. Call sync() after they
+    were moved or removed from elsewhere (reset of the map, fed dog...).
+    """
+
+    def __init__(self, sprite_list, radius, speed, flow_field=None):
+        self.sprite_list = sprite_list
+        self.radius = radius
+        self.speed = speed
+        self.flow_field = flow_field
+        self.sprites = []
+        self.positions = np.zeros((0, 2))
+        self.sync()
+
+    def sync(self):
+        """ Read the sprites and their positions again """
+        self.sprites = list(self.sprite_list)
+        self.positions = sprite_positions(self.sprites)
+
+    def update(self, target_x, target_y):
+        """ Move the sprites close to the target, return whether one moved """
+        if not self.sprites:
+            return False
+        offsets = np.array((target_x, target_y)) - self.positions
+        distances = np.sqrt((offsets ** 2).sum(axis=1))
+        if self.flow_field is not None:
+            close = distances < self.radius
+            if not close.any():
+                return False
+            self.flow_field.update(target_x, target_y)
+            offsets = self.flow_field.waypoints(self.positions, target_x, target_y) - self.positions
+            distances = np.sqrt((offsets ** 2).sum(axis=1))
+            # Too close, the direction is undefined
+            moving = close & (distances >= 0.01)
+        else:
+            moving = (distances < self.radius) & (distances >= 0.01)
+        indices = np.flatnonzero(moving)
+        if len(indices) == 0:
+            return False
+
+        steps = offsets[indices] / distances[indices, None] * self.speed
+        self.positions[indices] += steps
+        for index, position in zip(indices.tolist(), self.positions[indices].tolist()):
+            self.sprites[index].position = tuple(position)
+        return True
@@ -0,0 +1,67 @@
+from constants import *
+
+
+class FixedTimestep:
+    """
+    Runs the game logic in ticks of a fixed duration, whatever the rate of
+    the updates and of the draws, so the speeds (in pixels per tick) do not
+    depend on the frame rate.
+
+    The time of each update goes into an accumulator, and advance() tells
+    how many whole ticks it holds. What is left is the part of the next
+    tick already elapsed (alpha). At draw time the moving sprites are shown
+    that far between their position before and after the last tick, then
+    put back, so the logic never sees the interpolated positions.
+    """
+
+    def __init__(self, tick_rate=SIMULATION_RATE, max_ticks=MAX_TICKS_PER_UPDATE,
+                 interpolate=INTERPOLATE_SPRITES):
+        self.tick = 1 / tick_rate
+        self.max_ticks = max_ticks
+        self.interpolate = interpolate
+        self.accumulator = 0.0
+        # Moving sprites with their position before the last tick
+        self.previous = []
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.previous = []
+
+    @property
+    def alpha(self):
+        return self.accumulator / self.tick
+
+    def advance(self, delta_time):
+        """ Add the time of an update, return the number of ticks to run """
+        # Do not try to catch up a long pause (loading, window dragged...)
+        self.accumulator = min(self.accumulator + delta_time, self.tick * self.max_ticks)
+        # A little tolerance, or updates of exactly one tick would often run none
+        ticks = int(self.accumulator / self.tick + 1e-6)
+        self.accumulator = max(self.accumulator - ticks * self.tick, 0.0)
+        return ticks
+
+    def remember(self, sprites):
+        """ Keep the positions of the sprites before running a tick """
+        if self.interpolate:
+            self.previous = [(sprite, sprite.position) for sprite in sprites]
+
+    def forget(self):
+        """ The sprites jumped (new map...), draw them where they are """
+        self.previous = []
+
+    def interpolated(self):
+        """ Move the sprites between their last two positions, return their true ones """
+        alpha = self.alpha
+        moved = []
+        for sprite, (previous_x, previous_y) in self.previous:
+            x, y = position = sprite.position
+            if x != previous_x or y != previous_y:
+                sprite.position = (previous_x + (x - previous_x) * alpha,
+                                   previous_y + (y - previous_y) * alpha)
+                moved.append((sprite, position))
+        return moved
+
+    @staticmethod
+    def restore(moved):
+        for sprite, position in moved:
+            sprite.position = position
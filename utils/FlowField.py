@@ -0,0 +1,144 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Moves to the 8 neighbours of a cell, (column, row)
+NEIGHBOURS = [(0, 1), (0, -1), (-1, 0), (1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+# Worker thread shared by the flow fields, made when the first one needs it
+# and joined by concurrent.futures when the game exits
+_executor = None
+
+
+def shared_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="flow-field")
+    return _executor
+
+
+class FlowField:
+    """
+    Paths of every cell of a tile grid towards the tile of the player,
+    shared by all the enemies chasing it.
+
+    A breadth-first search from the player's tile gives the distance of
+    each cell around the walls, then every cell points to its neighbour
+    closest to the player (diagonals only when both sides are free). It
+    is computed again only when the player changes tile, on a worker
+    thread if asked, and reading the next step of a chaser is a lookup.
+    """
+
+    def __init__(self, tile_grid, wall_layers, worker=False):
+        self.grid = tile_grid
+        self.passable = (tile_grid.mask & tile_grid.layer_mask(wall_layers)) == 0
+        # Tile of the player the field leads to, as (row, column)
+        self.target = None
+        # Move to the next cell from each cell, (0, 0) at the target or when blocked
+        self.steps = np.zeros((tile_grid.rows, tile_grid.columns, 2), dtype=np.int64)
+        self.computations = 0
+        self.executor = shared_executor() if worker else None
+        self.pending = None
+
+    def cell(self, x, y):
+        return int(y // self.grid.cell_height), int(x // self.grid.cell_width)
+
+    def reset(self):
+        """ Drop the field being computed, the player starts over """
+        if self.pending is not None:
+            self.pending.cancel()
+            self.pending = None
+        self.target = None
+
+    def update(self, x, y):
+        """ Follow the player, computing the field again if it changed tile """
+        if self.pending is not None and self.pending.done():
+            self.steps = self.pending.result()
+            self.pending = None
+        target = self.cell(x, y)
+        if target == self.target:
+            return
+        self.target = target
+        if self.pending is not None:
+            self.pending.cancel()
+            self.pending = None
+        if not (0 <= target[0] < self.grid.rows and 0 <= target[1] < self.grid.columns):
+            self.steps = np.zeros_like(self.steps)
+        elif self.executor is None:
+            self.steps = self.compute(target)
+        else:
+            # The chasers keep the previous field until the new one is ready
+            self.pending = self.executor.submit(self.compute, target)
+
+    def compute(self, target):
+        """ Next move of every cell towards target, without touching self """
+        self.computations += 1
+        rows, columns = self.passable.shape
+        distances = np.full((rows, columns), np.inf)
+        # Free cells not reached yet
+        reachable = self.passable.copy()
+        reachable[target] = False
+        frontier = np.zeros((rows, columns), dtype=bool)
+        frontier[target] = True
+        distances[target] = 0
+        distance = 0
+        # One ring of cells around the walls at each step
+        grown = np.zeros_like(frontier)
+        while frontier.any():
+            distance += 1
+            grown[:] = False
+            grown[1:, :] |= frontier[:-1, :]
+            grown[:-1, :] |= frontier[1:, :]
+            grown[:, 1:] |= frontier[:, :-1]
+            grown[:, :-1] |= frontier[:, 1:]
+            # Cells reached for the first time
+            np.logical_and(grown, reachable, out=frontier)
+            reachable &= ~frontier
+            distances[frontier] = distance
+
+        padded = np.pad(distances, 1, constant_values=np.inf)
+
+        def shifted(column, row):
+            return padded[1 + row:1 + row + rows, 1 + column:1 + column + columns]
+
+        best = distances.copy()
+        steps = np.zeros((rows, columns, 2), dtype=np.int64)
+        for column, row in NEIGHBOURS:
+            neighbour = shifted(column, row)
+            if column and row:
+                # Do not cut the corner of a wall
+                free_sides = np.isfinite(shifted(column, 0)) & np.isfinite(shifted(0, row))
+                neighbour = np.where(free_sides, neighbour, np.inf)
+            closer = neighbour < best
+            best = np.where(closer, neighbour, best)
+            steps[closer] = (column, row)
+        return steps
+
+    def waypoints(self, positions, target_x, target_y):
+        """
+        Points the chasers at positions (an (n, 2) array) walk to: the center
+        of their next cell, or the player itself once in its tile or when no
+        path is known.
+        """
+        grid = self.grid
+        rows = np.floor(positions[:, 1] / grid.cell_height).astype(int)
+        columns = np.floor(positions[:, 0] / grid.cell_width).astype(int)
+        inside = (rows >= 0) & (rows < grid.rows) & (columns >= 0) & (columns < grid.columns)
+        steps = np.zeros((len(positions), 2), dtype=np.int64)
+        steps[inside] = self.steps[rows[inside], columns[inside]]
+        aims = np.empty_like(positions)
+        aims[:, 0] = (columns + steps[:, 0] + 0.5) * grid.cell_width
+        aims[:, 1] = (rows + steps[:, 1] + 0.5) * grid.cell_height
+        direct = (steps == 0).all(axis=1)
+        aims[direct] = (target_x, target_y)
+        return aims
+
+    def waypoint(self, x, y, target_x, target_y):
+        """ Same as waypoints() for a single chaser """
+        row, column = self.cell(x, y)
+        if 0 <= row < self.grid.rows and 0 <= column < self.grid.columns:
+            step_column, step_row = self.steps[row, column].tolist()
+            if step_column or step_row:
+                return ((column + step_column + 0.5) * self.grid.cell_width,
+                        (row + step_row + 0.5) * self.grid.cell_height)
+        return target_x, target_y
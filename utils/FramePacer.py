@@ -0,0 +1,134 @@
+import arcade
+import pyglet
+
+from constants import *
+
+# Interval given to pyglet's own redraw, which PacedEventLoop replaces: a year
+NEVER = 365 * 24 * 3600
+
+
+class FramePacer:
+    """
+    Slows the game loop down on screens where nothing happens.
+
+    At full rate the window is updated every frame_interval and drawn every
+    draw_interval (0 draws as often as possible). The game logic runs in
+    fixed ticks whatever these rates, see FixedTimestep.
+
+    The views report every update whether something is moving. After
+    IDLE_DELAY seconds without activity, updates run every IDLE_INTERVAL
+    seconds and the window is only redrawn when a view asked for it with
+    request_redraw(). Any input, or activity reported by a view, goes back
+    to the full rate right away.
+
+    The draws are timed by PacedEventLoop.
+    """
+
+    def __init__(self, frame_interval=FRAME_INTERVAL, idle_interval=IDLE_INTERVAL,
+                 idle_delay=IDLE_DELAY, draw_interval=DRAW_INTERVAL):
+        self.frame_interval = frame_interval
+        self.draw_interval = draw_interval
+        self.idle_interval = idle_interval
+        self.idle_delay = idle_delay
+        self.idle = False
+        self.quiet_time = 0.0
+        self.dirty = True
+        self.window = None
+
+    def attach(self, window):
+        """ Redraw when the window is uncovered or resized, even while idle """
+        if self.window is window:
+            return
+        self.window = window
+        window.push_handlers(on_expose=self.request_redraw,
+                             on_resize=lambda width, height: self.request_redraw())
+
+    def request_redraw(self):
+        """ Ask for one more frame to be drawn, without leaving the idle mode """
+        self.dirty = True
+
+    def wake(self):
+        """ Go back to the full rate (input or simulation activity) """
+        self.quiet_time = 0.0
+        self.dirty = True
+        if not self.idle:
+            return
+        self.idle = False
+        self.window.set_update_rate(self.frame_interval)
+
+    def update(self, delta_time, active):
+        """ Called by the shown view at the end of each update """
+        self.attach(arcade.get_window())
+        if active:
+            self.wake()
+            return
+        self.quiet_time += delta_time
+        if self.idle or self.quiet_time < self.idle_delay:
+            return
+        self.idle = True
+        self.window.set_update_rate(self.idle_interval)
+
+    def draw_interval_now(self):
+        return self.idle_interval if self.idle else self.draw_interval
+
+    def draw_allowed(self):
+        """ Whether a draw that is due happens, unchanged frames are skipped while idle """
+        if not self.idle:
+            return True
+        if not self.dirty:
+            return False
+        self.dirty = False
+        return True
+
+
+class PacedEventLoop(pyglet.app.EventLoop):
+    """
+    pyglet's event loop, drawing the windows when the frame pacer asks for
+    it instead of at the fixed interval of pyglet.app.run(). It only relies
+    on what pyglet documents for subclasses: idle() is called after the
+    window events and returns the time to sleep before the next call.
+    """
+
+    def __init__(self, pacer):
+        super().__init__()
+        self.pacer = pacer
+        # Time the last draw was due, the next ones keep a regular rhythm from it
+        self.last_due = None
+
+    def run(self, interval=None):
+        # The draws are done by idle(), pyglet's own redraw never comes
+        super().run(NEVER)
+
+    def idle(self):
+        dt = self.clock.update_time()
+        self.clock.call_scheduled_functions(dt)
+
+        now = self.clock.time()
+        if self.last_due is None:
+            self.last_due = now
+        interval = self.pacer.draw_interval_now()
+        due = self.last_due + interval
+        if now >= due:
+            # Late by more than a frame: start the rhythm again from now
+            self.last_due = due if now - due < interval else now
+            if self.pacer.draw_allowed():
+                for window in pyglet.app.windows:
+                    window.switch_to()
+                    window.dispatch_event("on_draw")
+                    window.dispatch_event("on_refresh", dt)
+                    window.flip()
+            due = self.last_due + interval
+
+        # Wake up for the next draw or the next scheduled function (updates)
+        until_draw = max(due - self.clock.time(), 0.0)
+        sleep_time = self.clock.get_sleep_time(True)
+        return until_draw if sleep_time is None else min(sleep_time, until_draw)
+
+
+# Frame pacer shared by the views of the game
+frame_pacer = FramePacer()
+
+
+def install_event_loop():
+    """ Let the frame pacer decide the draws, to call before arcade.run() """
+    pyglet.app.event_loop = PacedEventLoop(frame_pacer)
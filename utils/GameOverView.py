@@ -1,5 +1,8 @@
 import arcade
 from constants import *
+from utils.AssetManager import asset_manager
+from utils.Backgrounds import background_path
+from utils.FramePacer import frame_pacer
 
 
 class GameOverView(arcade.View):
@@ -10,12 +13,12 @@ class GameOverView(arcade.View):
         super().__init__()
         arcade.set_viewport(0, SCREEN_WIDTH - 1, 0, SCREEN_HEIGHT - 1)
         self.gameview = gameview
-        arcade.stop_sound(self.gameview.current_music_player)
+        self.gameview.stop_music()
 
         # Load background image
         # Update to the correct path for your background
-        self.background_image = arcade.load_texture(
-            "assets/images/backgrounds/game_over.jpg")
+        self.background_image = asset_manager.load_texture(
+            background_path("assets/images/backgrounds/game_over.jpg"))
 
         # Initialize the UI manager and vertical box layout
         self.manager = arcade.gui.UIManager()
@@ -36,11 +39,11 @@ class GameOverView(arcade.View):
         self.create_buttons()
 
         # Load the game over image
-        self.game_over_image = arcade.load_texture(
+        self.game_over_image = asset_manager.load_texture(
             "assets/images/items/coeurBrise.png")  # Change the path to your image file
 
         # Load and prepare background music
-        self.game_over_music = arcade.load_sound(
+        self.game_over_music = asset_manager.load_music(
             "assets/sounds/game_over_sound.mp3")
         self.current_music_player = None
 
@@ -97,8 +100,22 @@ class GameOverView(arcade.View):
         # Draw the UI manager (this draws the buttons)
         self.manager.draw()
 
+    def on_update(self, delta_time):
+        # Nothing moves on this screen, only the buttons wake it up
+        frame_pacer.update(delta_time, False)
+
+    def on_mouse_motion(self, x, y, dx, dy):
+        frame_pacer.wake()
+
+    def on_mouse_press(self, x, y, button, modifiers):
+        frame_pacer.wake()
+
+    def on_key_press(self, key, modifiers):
+        frame_pacer.wake()
+
     def on_show_view(self):
         """ This is called when we switch to this view """
+        frame_pacer.wake()
         # Make sure the mouse cursor is visible
         self.window.set_mouse_visible(True)
 
@@ -113,3 +130,8 @@ class GameOverView(arcade.View):
         # Stop the music when leaving the view
         if self.current_music_player:
             arcade.stop_sound(self.current_music_player)
+
+        # This view is created again at the next game over
+        asset_manager.release(self.background_image)
+        asset_manager.release(self.game_over_image)
+        asset_manager.release(self.game_over_music)
@@ -7,6 +7,14 @@ from maps.EndingMap import EndingMap
 from maps.ForestMap import ForestMap
 from maps.IntroductionMap import IntroductionMap
 from maps.WinterMap import WinterMap
+from utils.ViewRegistry import ViewRegistry
+from utils.AssetManager import asset_manager
+from utils.MusicEngine import TimelineMusic
+from utils.PastEffect import PastEffect
+from utils.Hud import Hud
+from utils.FramePacer import frame_pacer
+from utils.FixedTimestep import FixedTimestep
+from utils.InputState import InputState, SWITCH_TENSE
 
 
 class GameView(arcade.View):
@@ -15,47 +23,34 @@ class GameView(arcade.View):
     """
 
     def restart(self):
-        """ Reset game state to start over """
-        super().__init__()
-        arcade.stop_sound(self.current_music_player)
-        # Music variables
-        self.background_music = None  # Music for the introduction
-        self.present_music = None     # Music for the present
-        self.past_music = None        # Music for the past
-        self.current_music_player = None  # Current music player instance
+        """
+        Reset game state to start over. The loaded sounds, textures and maps
+        are kept, each map is put back in the state it had after loading.
+        """
+        self.stop_music()
+        self.views.cancel_prefetch()
 
-        self.player_sprite = None
         self.temporal_state = PRESENT  # Current temporal state
-        self.current_view = 0          # Keep track of the current view
-        self.physics_engine = None
-        self.setup()
+        self.show_map(0)
 
         # HUD elements
         self.time_elapsed = 0
         self.items_collected = 0
+        self.past_effect.reset()
+        self.timestep.reset()
+        self.input.clear()
 
-        # Load the torch image sprite
-        self.torch_sprite = arcade.Sprite(
-            ":resources:images/tiles/torch2.png", 0.30)
-
-        # Set the position of the torch sprite where the "Time" text was
-        self.torch_sprite.center_x = SCREEN_WIDTH - 100
-        self.torch_sprite.center_y = SCREEN_HEIGHT - 30
-
-        self.star_sprite = arcade.Sprite(
-            ":resources:images/items/star.png", 0.5)
-        self.star_sprite.center_x = SCREEN_WIDTH - 100
-        self.star_sprite.center_y = SCREEN_HEIGHT - 60
+        # Put the player back at the center of the screen for the introduction
+        self.player_sprite.reset()
+        self.player_sprite.center_x = SCREEN_WIDTH // 2
+        self.player_sprite.center_y = SCREEN_HEIGHT // 2
 
-        # Create the views (levels)
-        self.views = [
-            IntroductionMap(self),
-            CityMap(self, self.player_sprite),
-            ForestMap(self, self.player_sprite),
-            WinterMap(self, self.player_sprite),
-            EndingMap(self)
+        for view in self.views.built_views():
+            view.reset()
 
-        ]
+        # Play the introduction music again
+        self.current_music_player = arcade.play_sound(
+            self.background_music, volume=MUSIC_VOLUME, looping=True)
 
     def __init__(self):
         super().__init__()
@@ -64,56 +59,68 @@ class GameView(arcade.View):
         self.present_music = None     # Music for the present
         self.past_music = None        # Music for the past
         self.current_music_player = None  # Current music player instance
+        self.timeline_music = None    # Present and past musics played together
 
         self.player_sprite = None
         self.temporal_state = PRESENT  # Current temporal state
         self.current_view = 0          # Keep track of the current view
         self.physics_engine = None
+        # Game logic run in ticks of a fixed duration
+        self.timestep = FixedTimestep()
+        # Keys held and actions pressed, read by the ticks
+        self.input = InputState()
+        # Look of the past, shared by the maps
+        self.past_effect = PastEffect()
         self.setup()
 
         # HUD elements
         self.time_elapsed = 0
         self.items_collected = 0
 
-        # Load the torch image sprite
-        self.torch_sprite = arcade.Sprite(
-            ":resources:images/tiles/torch2.png", 0.30)
-
-        # Set the position of the torch sprite where the "Time" text was
-        self.torch_sprite.center_x = SCREEN_WIDTH - 100
-        self.torch_sprite.center_y = SCREEN_HEIGHT - 30
-
-        self.star_sprite = arcade.Sprite(
-            ":resources:images/items/star.png", 0.5)
-        self.star_sprite.center_x = SCREEN_WIDTH - 100
-        self.star_sprite.center_y = SCREEN_HEIGHT - 60
+        # Time, collected items and commands drawn over the maps
+        self.hud = Hud(self.format_time)
 
         # Create the views (levels)
-        self.views = [
-            IntroductionMap(self),
-            CityMap(self, self.player_sprite),
-            ForestMap(self, self.player_sprite),
-            WinterMap(self, self.player_sprite),
-
-            EndingMap(self)
-
-        ]
+        self.create_views()
+
+    def create_views(self):
+        """ Register the views (levels), each one is built when first shown """
+        self.views = ViewRegistry([
+            lambda: IntroductionMap(self),
+            lambda: CityMap(self, self.player_sprite),
+            lambda: ForestMap(self, self.player_sprite),
+            lambda: WinterMap(self, self.player_sprite),
+            lambda: EndingMap(self)
+        ], prefetching=PREFETCH_NEXT_VIEW)
+        # The introduction is shown right away
+        self.views.get(0)
 
     def change_view(self, new_view_index):
         """
         Change the current view to the specified map view index.
         This also resets the player's position.
         """
-        self.current_view = new_view_index
+        self.show_map(new_view_index)
         self.player_sprite.center_x = PLAYER_START_X  # Réinitialiser la position X
         self.player_sprite.center_y = PLAYER_START_Y  # Réinitialiser la position Y
 
     def change_music(self, new_music):
         """ Stop the current music and play new music """
+        self.stop_music()
+        self.current_music_player = arcade.play_sound(
+            new_music, volume=MUSIC_VOLUME, looping=True)
+
+    def start_timeline_music(self):
+        """ Stop the current music and play the present and past tracks """
+        self.stop_music()
+        self.timeline_music.start(PRESENT)
+
+    def stop_music(self):
+        """ Stop every music currently playing """
         if self.current_music_player:
             arcade.stop_sound(self.current_music_player)
-        self.current_music_player = arcade.play_sound(
-            new_music, volume=0.5, looping=True)
+            self.current_music_player = None
+        self.timeline_music.stop()
 
     def setup(self):
         """ Set up the game here. """
@@ -123,13 +130,14 @@ class GameView(arcade.View):
         self.player_sprite.center_y = SCREEN_HEIGHT // 2
 
         # Load and play background music for the introduction
-        self.background_music = arcade.load_sound("assets/sounds/intro.mp3")
+        self.background_music = asset_manager.load_music("assets/sounds/intro.mp3")
         self.current_music_player = arcade.play_sound(
-            self.background_music, volume=0.5, looping=True)
+            self.background_music, volume=MUSIC_VOLUME, looping=True)
 
         # Load music for present and past
-        self.present_music = arcade.load_sound("assets/sounds/present.mp3")
-        self.past_music = arcade.load_sound("assets/sounds/passe.mp3")
+        self.present_music = asset_manager.load_music("assets/sounds/present.mp3")
+        self.past_music = asset_manager.load_music("assets/sounds/passe.mp3")
+        self.timeline_music = TimelineMusic(self.present_music, self.past_music)
 
     def format_time(self, seconds):
         """ Format the elapsed time into hours, minutes, and seconds without showing zero units. """
@@ -150,92 +158,83 @@ class GameView(arcade.View):
         """ Draw the current view based on the current temporal state. """
         self.clear()
 
+        # Show the moving sprites between their last two ticks
+        moved = self.timestep.interpolated()
+
         # Draw the current view
         self.views[self.current_view].on_draw()
 
         # Draw the player
         self.player_sprite.draw()
 
-        # Format the time in hours, minutes, and seconds
-        formatted_time = self.format_time(self.time_elapsed)
-
-        # Draw a black transparent background rectangle for time and collected items
-        arcade.draw_rectangle_filled(
-            SCREEN_WIDTH - 50, SCREEN_HEIGHT - 50, 200, 80, arcade.color.BLACK + (150,))
-
-        # Draw the formatted time next to the torch image
-        arcade.draw_text(f"{formatted_time}", SCREEN_WIDTH - 88, SCREEN_HEIGHT - 40,
-                         arcade.color.WHITE, 20, bold=True)
-
-        # Draw the torch sprite (replacing the "Time" text)
-        self.torch_sprite.draw()
-
-        # Draw the star sprite for collected items
-        self.star_sprite.draw()
-
-        # Draw the collected items number next to the star
-        arcade.draw_text(f"{self.items_collected}", SCREEN_WIDTH - 80, SCREEN_HEIGHT - 70,
-                         arcade.color.WHITE, 20, bold=True)
-
-        # Draw a text for the commands at the bottom right with improved style
-        arcade.draw_text("Press ", SCREEN_WIDTH - 240,
-                         62, arcade.color.WHITE, 12, bold=True)
-        arcade.draw_text("Enter", SCREEN_WIDTH - 190, 62,
-                         arcade.color.YELLOW, 14, bold=True)
-        arcade.draw_text(" to interact", SCREEN_WIDTH -
-                         135, 62, arcade.color.WHITE, 12, bold=True)
-
-        arcade.draw_text("Press ", SCREEN_WIDTH - 250,
-                         40, arcade.color.WHITE, 12, bold=True)
-        arcade.draw_text("SPACE", SCREEN_WIDTH - 200, 40,
-                         arcade.color.YELLOW, 14, bold=True)
-        arcade.draw_text(" to switch time", SCREEN_WIDTH -
-                         135, 40, arcade.color.WHITE, 12, bold=True)
-
-        arcade.draw_text("Use ", SCREEN_WIDTH - 250,
-                         20, arcade.color.WHITE, 12, bold=True)
-        arcade.draw_text("arrow keys", SCREEN_WIDTH - 210, 20,
-                         arcade.color.YELLOW, 14, bold=True)
-        arcade.draw_text(" to move", SCREEN_WIDTH - 110,
-                         20, arcade.color.WHITE, 12, bold=True)
+        self.timestep.restore(moved)
 
-    def on_key_press(self, key, modifiers):
-        """ Handle key press for moving the player and switching temporal state. """
-        if key == arcade.key.SPACE:
-            # Switch temporal state
-            if self.temporal_state == PRESENT:
-                self.temporal_state = PAST
-                self.change_music(self.past_music)  # Play past music
-
-            else:
-                self.temporal_state = PRESENT
-                self.change_music(self.present_music)  # Play present music
+        # Draw the HUD
+        self.hud.draw()
 
-        # Handle player movement
-        if key == arcade.key.RIGHT:
-            self.player_sprite.change_x = PLAYER_MOVEMENT_SPEED
-        elif key == arcade.key.LEFT:
-            self.player_sprite.change_x = -PLAYER_MOVEMENT_SPEED
-        elif key == arcade.key.UP:
-            self.player_sprite.change_y = PLAYER_MOVEMENT_SPEED
-        elif key == arcade.key.DOWN:
-            self.player_sprite.change_y = -PLAYER_MOVEMENT_SPEED
-
-        self.views[self.current_view].on_key_press(key, modifiers)
+    def on_key_press(self, key, modifiers):
+        """ Record the key, the next tick moves the player or runs its action. """
+        frame_pacer.wake()
+        self.input.press(key)
 
     def on_key_release(self, key, modifiers):
-        """ Handle key release for player movement. """
-        if key in [arcade.key.RIGHT, arcade.key.LEFT]:
-            self.player_sprite.change_x = 0
-        elif key in [arcade.key.UP, arcade.key.DOWN]:
-            self.player_sprite.change_y = 0
-
-        self.views[self.current_view].on_key_release(key, modifiers)
+        """ Record the key, the next tick stops the movement. """
+        frame_pacer.wake()
+        self.input.release(key)
+
+    def switch_tense(self):
+        """ Switch temporal state """
+        if self.temporal_state == PRESENT:
+            self.temporal_state = PAST
+        else:
+            self.temporal_state = PRESENT
+        # Crossfade to the music of the new tense
+        self.timeline_music.set_tense(self.temporal_state)
+
+    def read_input(self):
+        """ Run the actions pressed since the last tick, then follow the held arrows """
+        view = self.views[self.current_view]
+        for action in self.input.take_actions():
+            if action == SWITCH_TENSE:
+                self.switch_tense()
+            view.on_action(action)
+
+        direction_x, direction_y = self.input.direction()
+        self.player_sprite.move(direction_x, direction_y)
+        view.on_direction(direction_x, direction_y)
 
     def on_update(self, delta_time):
-        """ Update the current view and check for map transitions. """
-        self.player_sprite.update()
+        """ Run the ticks of game logic due since the last update. """
+        previous_view = self.current_view
         self.time_elapsed += delta_time
+        self.timeline_music.update(delta_time)
+        self.past_effect.update(delta_time)
+
+        for _ in range(self.timestep.advance(delta_time)):
+            self.timestep.remember(self.moving_sprites())
+            self.on_tick(self.timestep.tick)
+            # Game over, the next ticks belong to another run
+            if self.window.current_view is not self:
+                break
+
+        # Build the next map while the player is in this one, but only while
+        # nothing moves on the screen: building a map takes several frames
+        self.views.prefetch(self.current_view + 1)
+        if frame_pacer.idle:
+            self.views.build_pending()
+
+        # Only the texts whose value changed are laid out again
+        if self.hud.update(self.time_elapsed, self.items_collected):
+            frame_pacer.request_redraw()
+
+        # Slow down while nothing moves on the screen
+        frame_pacer.update(delta_time, self.is_active() or self.current_view != previous_view)
+
+    def on_tick(self, delta_time):
+        """ Move everything by one tick and check for map transitions. """
+        previous_view = self.current_view
+        self.read_input()
+        self.player_sprite.update()
         self.views[self.current_view].on_update(delta_time)
 
         # Check if the player has reached the right or left edge
@@ -251,4 +250,36 @@ class GameView(arcade.View):
                 self.current_view = (self.current_view - 1) % len(self.views)
                 self.player_sprite.center_x = SCREEN_WIDTH - \
                     PLAYER_BORDER_PADDING  # Reset player to right edge
-                
+
+        if self.current_view != previous_view:
+            # The player jumped to another map, nothing to draw in between
+            self.timestep.forget()
+            self.views[previous_view].release_assets()
+            self.views[self.current_view].acquire_assets()
+
+    def show_map(self, index):
+        """ Go to a map at once, the textures of the one left may be evicted """
+        if index != self.current_view:
+            self.views[self.current_view].release_assets()
+            self.current_view = index
+            self.views[index].acquire_assets()
+
+    def moving_sprites(self):
+        """ Sprites interpolated at draw time: the player and those moved by the map """
+        return [self.player_sprite, *self.views[self.current_view].moving_sprites()]
+
+    def is_active(self):
+        """ Whether something is moving or fading on the screen """
+        return bool(self.player_sprite.change_x or self.player_sprite.change_y
+                    or self.past_effect.transitioning or self.timeline_music.fading
+                    or self.views[self.current_view].is_active())
+
+    def on_show_view(self):
+        frame_pacer.wake()
+
+    def on_mouse_motion(self, x, y, dx, dy):
+        # The buttons of the introduction and the ending react to the mouse
+        frame_pacer.wake()
+
+    def on_mouse_press(self, x, y, button, modifiers):
+        frame_pacer.wake()
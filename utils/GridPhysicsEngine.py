@@ -0,0 +1,92 @@
+import math
+
+import arcade
+
+
+class GridPhysicsEngine:
+    """
+    Replacement of arcade.PhysicsEngineSimple keeping the player out of
+    the layers of a TileGrid, with a few cell lookups per test instead of
+    polygon tests against the tiles. The layers that move or lose sprites
+    (dogs, cars, collectables) are still tested sprite by sprite.
+
+    The moves are resolved like arcade does it, so the player slides along
+    the walls the same way: first along y, backing off until free, then
+    along x with a binary search of the longest move that fits.
+    """
+
+    def __init__(self, player_sprite, grid, grid_layers, walls=None):
+        self.player_sprite = player_sprite
+        self.grid = grid
+        self.mask = grid.layer_mask(grid_layers)
+        self.walls = list(walls or [])
+        # Hit box of the player around its center, computed at each update
+        self.extent = (0, 0, 0, 0)
+
+    def collides(self):
+        player = self.player_sprite
+        left, bottom, right, top = self.extent
+        x = player.center_x
+        y = player.center_y
+        if self.grid.collides(self.mask, x + left, y + bottom, x + right, y + top, player):
+            return True
+        return bool(self.walls) and bool(arcade.check_for_collision_with_lists(player, self.walls))
+
+    def escape(self):
+        """ Same search as arcade when the player starts inside a wall """
+        player = self.player_sprite
+        original_x = player.center_x
+        original_y = player.center_y
+        vary = 1
+        while True:
+            for dx, dy in ((0, 1), (0, -1), (1, 0), (-1, 0),
+                           (1, 1), (1, -1), (-1, 1), (-1, -1)):
+                player.center_x = original_x + dx * vary
+                player.center_y = original_y + dy * vary
+                if not self.collides():
+                    return
+            vary *= 2
+
+    def update(self):
+        player = self.player_sprite
+        x = player.center_x
+        y = player.center_y
+        self.extent = (player.left - x, player.bottom - y, player.right - x, player.top - y)
+
+        if self.collides():
+            self.escape()
+        original_x = player.center_x
+
+        # Move along y, then back off to the edge of the wall
+        change_y = player.change_y
+        player.center_y += change_y
+        if self.collides():
+            if change_y > 0:
+                while self.collides():
+                    player.center_y -= 1
+            elif change_y < 0:
+                while self.collides():
+                    player.center_y += 0.25
+            player.change_y = 0.0
+        player.center_y = round(player.center_y, 2)
+
+        # Move along x, as far as possible
+        if player.change_x:
+            direction = math.copysign(1, player.change_x)
+            cur_x_change = abs(player.change_x)
+            upper_bound = cur_x_change
+            lower_bound = 0
+            while True:
+                player.center_x = original_x + cur_x_change * direction
+                if self.collides():
+                    upper_bound = cur_x_change - 1
+                    if upper_bound - lower_bound <= 0:
+                        cur_x_change = lower_bound
+                        break
+                    cur_x_change = (upper_bound + lower_bound) // 2
+                else:
+                    lower_bound = cur_x_change
+                    if upper_bound - lower_bound <= 0:
+                        break
+                    cur_x_change = (upper_bound + lower_bound) // 2 + (upper_bound + lower_bound) % 2
+            player.center_x = original_x + cur_x_change * direction
@@ -0,0 +1,85 @@
+import arcade
+import pyglet
+
+from constants import *
+from utils.AssetManager import asset_manager
+
+# Commands shown at the bottom right: (text, x, y, color, font size)
+HINTS = [
+    ("Press ", SCREEN_WIDTH - 240, 62, arcade.color.WHITE, 12),
+    ("Enter", SCREEN_WIDTH - 190, 62, arcade.color.YELLOW, 14),
+    (" to interact", SCREEN_WIDTH - 135, 62, arcade.color.WHITE, 12),
+    ("Press ", SCREEN_WIDTH - 250, 40, arcade.color.WHITE, 12),
+    ("SPACE", SCREEN_WIDTH - 200, 40, arcade.color.YELLOW, 14),
+    (" to switch time", SCREEN_WIDTH - 135, 40, arcade.color.WHITE, 12),
+    ("Use ", SCREEN_WIDTH - 250, 20, arcade.color.WHITE, 12),
+    ("arrow keys", SCREEN_WIDTH - 210, 20, arcade.color.YELLOW, 14),
+    (" to move", SCREEN_WIDTH - 110, 20, arcade.color.WHITE, 12),
+]
+
+
+class Hud:
+    """
+    Time, collected items and commands shown over the maps. Everything is
+    built once: the background and the texts are in one pyglet batch and
+    the icons in one sprite list, so the HUD costs two draw calls. A text
+    is only laid out again when its value changes.
+    """
+
+    def __init__(self, format_time):
+        self.format_time = format_time
+        self.batch = pyglet.graphics.Batch()
+        background = pyglet.graphics.Group(order=0)
+        foreground = pyglet.graphics.Group(order=1)
+
+        # Black transparent background for the time and the collected items
+        self.background = pyglet.shapes.Rectangle(
+            SCREEN_WIDTH - 150, SCREEN_HEIGHT - 90, 200, 80, color=(0, 0, 0, 150),
+            batch=self.batch, group=background)
+
+        self.time_label = self.create_label("", SCREEN_WIDTH - 88, SCREEN_HEIGHT - 40,
+                                            arcade.color.WHITE, 20, foreground)
+        self.items_label = self.create_label("", SCREEN_WIDTH - 80, SCREEN_HEIGHT - 70,
+                                             arcade.color.WHITE, 20, foreground)
+        self.hint_labels = [self.create_label(*hint, foreground) for hint in HINTS]
+        self.shown_seconds = None
+        self.shown_items = None
+
+        # The torch replaces the "Time" text, the star is for the collected items
+        self.icons = arcade.SpriteList()
+        torch = arcade.Sprite(texture=asset_manager.load_texture(
+            ":resources:images/tiles/torch2.png"), scale=0.30)
+        torch.center_x = SCREEN_WIDTH - 100
+        torch.center_y = SCREEN_HEIGHT - 30
+        star = arcade.Sprite(texture=asset_manager.load_texture(
+            ":resources:images/items/star.png"), scale=0.5)
+        star.center_x = SCREEN_WIDTH - 100
+        star.center_y = SCREEN_HEIGHT - 60
+        self.icons.extend([torch, star])
+
+    def create_label(self, text, x, y, color, font_size, group):
+        return pyglet.text.Label(text, font_name=FONT_NAME, font_size=font_size, bold=True,
+                                 color=arcade.get_four_byte_color(color), x=x, y=y,
+                                 batch=self.batch, group=group)
+
+    def update(self, time_elapsed, items_collected):
+        """
+        Change the texts whose value changed since the last frame. Returns
+        True when something changed.
+        """
+        changed = False
+        seconds = int(time_elapsed)
+        if seconds != self.shown_seconds:
+            self.shown_seconds = seconds
+            self.time_label.text = self.format_time(seconds)
+            changed = True
+        if items_collected != self.shown_items:
+            self.shown_items = items_collected
+            self.items_label.text = str(items_collected)
+            changed = True
+        return changed
+
+    def draw(self):
+        with arcade.get_window().ctx.pyglet_rendering():
+            self.batch.draw()
+        self.icons.draw()
@@ -0,0 +1,66 @@
+import arcade
+
+# Actions queued once per key press, run at the start of the next tick
+INTERACT = "interact"
+SWITCH_TENSE = "switch_tense"
+ACTION_KEYS = {
+    arcade.key.ENTER: INTERACT,
+    arcade.key.SPACE: SWITCH_TENSE,
+}
+
+# Direction of the arrow keys, (x, y)
+MOVEMENT_KEYS = {
+    arcade.key.RIGHT: (1, 0),
+    arcade.key.LEFT: (-1, 0),
+    arcade.key.UP: (0, 1),
+    arcade.key.DOWN: (0, -1),
+}
+
+
+class InputState:
+    """
+    State of the keyboard, read by the game logic once per tick.
+
+    The window events only record the keys held and queue the actions of
+    the keys pressed. Each tick then takes the queued actions and reads the
+    direction of the held arrow keys. When two opposite arrows are held the
+    last one pressed wins, and releasing it goes back to the other one.
+    """
+
+    def __init__(self):
+        # Keys held, in the order they were pressed
+        self.held = {}
+        self.actions = []
+
+    def press(self, key):
+        self.held.pop(key, None)
+        self.held[key] = True
+        action = ACTION_KEYS.get(key)
+        if action is not None:
+            self.actions.append(action)
+
+    def release(self, key):
+        self.held.pop(key, None)
+
+    def clear(self):
+        """ Forget the keys and the actions, when the game restarts """
+        self.held.clear()
+        self.actions.clear()
+
+    def direction(self):
+        """ Direction of the held arrow keys, each coordinate being -1, 0 or 1 """
+        direction_x = direction_y = 0
+        # The keys pressed later override the earlier ones
+        for key in self.held:
+            x, y = MOVEMENT_KEYS.get(key, (0, 0))
+            if x:
+                direction_x = x
+            if y:
+                direction_y = y
+        return direction_x, direction_y
+
+    def take_actions(self):
+        """ Actions queued since the last tick, in the order of the key presses """
+        actions = self.actions
+        self.actions = []
+        return actions
@@ -0,0 +1,126 @@
+import math
+
+
+class Interactable:
+    """ A sprite the player can use with ENTER, and what happens then """
+
+    __slots__ = ("order", "group", "sprite", "action", "radius", "tense", "condition",
+                 "skip_after_remove")
+
+    def __init__(self, order, group, sprite, action, radius, tense, condition,
+                 skip_after_remove):
+        self.order = order
+        # Order of the first sprite registered with it
+        self.group = group
+        self.sprite = sprite
+        self.action = action
+        self.radius = radius
+        self.tense = tense
+        self.condition = condition
+        self.skip_after_remove = skip_after_remove
+
+
+class InteractableRegistry:
+    """
+    Index of the sprites of a map the player can interact with, by tile.
+
+    The maps register their interactables when they are loaded, with the
+    tense they can be used in (None for both) and the action called with
+    the sprite. Pressing ENTER then only looks at the tiles around the
+    player instead of scanning whole layers. The sprites are expected to
+    stay on their tile, removing one (once collected) is done with remove().
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        # Interactables by (column, row)
+        self.cells = {}
+        # Cell of each registered sprite still in the index
+        self.sprite_cells = {}
+        # Everything registered, in order, to put back on reset()
+        self.entries = []
+        # Number of cells to look at around a position
+        self.reach = 0
+
+    def cell(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def register(self, sprites, action, radius, tense=None, condition=None,
+                 skip_after_remove=False):
+        """
+        Add sprites used from closer than radius. The optional condition is
+        checked at the time of the interaction, before calling the action.
+
+        With skip_after_remove, the sprite following one removed by the
+        action is left for the next press, like a for loop over the sprite
+        list the action removes from.
+        """
+        group = len(self.entries)
+        for sprite in sprites:
+            entry = Interactable(len(self.entries), group, sprite, action, radius, tense,
+                                 condition, skip_after_remove)
+            self.entries.append(entry)
+            self.add(entry)
+        self.reach = max(self.reach, math.ceil(radius / self.cell_size))
+
+    def add(self, entry):
+        cell = self.cell(entry.sprite.center_x, entry.sprite.center_y)
+        self.cells.setdefault(cell, []).append(entry)
+        self.sprite_cells[entry.sprite] = cell
+
+    def remove(self, sprite):
+        """ Forget a sprite that was collected or used up """
+        cell = self.sprite_cells.pop(sprite, None)
+        if cell is None:
+            return
+        entries = [entry for entry in self.cells[cell] if entry.sprite is not sprite]
+        if entries:
+            self.cells[cell] = entries
+        else:
+            del self.cells[cell]
+
+    def reset(self):
+        """ Put back every registered sprite, when the map is reset """
+        self.cells.clear()
+        self.sprite_cells.clear()
+        for entry in self.entries:
+            self.add(entry)
+
+    def near(self, x, y, tense=None):
+        """ Interactables of the tense closer than their radius, in the order they were registered """
+        column, row = self.cell(x, y)
+        found = []
+        for cell_row in range(row - self.reach, row + self.reach + 1):
+            for cell_column in range(column - self.reach, column + self.reach + 1):
+                for entry in self.cells.get((cell_column, cell_row), ()):
+                    if tense is not None and entry.tense is not None and entry.tense != tense:
+                        continue
+                    dx = entry.sprite.center_x - x
+                    dy = entry.sprite.center_y - y
+                    if dx * dx + dy * dy < entry.radius * entry.radius:
+                        found.append(entry)
+        found.sort(key=lambda entry: entry.order)
+        return found
+
+    def follows(self, previous, entry):
+        """ Whether entry is next to previous among the sprites left of their list """
+        return entry.group == previous.group and not any(
+            self.entries[order].sprite in self.sprite_cells
+            for order in range(previous.order + 1, entry.order))
+
+    def interact(self, x, y, tense):
+        """ Run the actions of the interactables around a position """
+        removed = None
+        for entry in self.near(x, y, tense):
+            # An earlier action may have removed it or changed the condition
+            if entry.sprite not in self.sprite_cells:
+                continue
+            if removed is not None and self.follows(removed, entry):
+                # It took the place of the removed sprite in the list
+                removed = None
+                continue
+            removed = None
+            if entry.condition is None or entry.condition():
+                entry.action(entry.sprite)
+                if entry.skip_after_remove and entry.sprite not in self.sprite_cells:
+                    removed = entry
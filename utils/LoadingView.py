@@ -0,0 +1,200 @@
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import arcade
+
+import maps.CityMap as city
+import maps.ForestMap as forest
+import maps.WinterMap as winter
+from constants import *
+from Player import MAIN_PATH, WALK_FRAMES
+from utils.AssetManager import AssetManager, asset_manager
+from utils.Backgrounds import background_path
+from utils.Music import Music
+from utils.TilemapCache import finish_tilemap, prepare_tilemap
+
+logger = logging.getLogger(__name__)
+
+# Images shown outside of the tile maps: (path, flipped horizontally)
+PRELOADED_TEXTURES = [
+    (background_path("assets/images/backgrounds/house_map_present.png"), False),
+    (background_path("assets/images/backgrounds/kelly_house.png"), False),
+    (background_path("assets/images/backgrounds/game_over.jpg"), False),
+    ("assets/images/items/coeurBrise.png", False),
+    ("assets/maps/city/tool.png", False),
+    ("assets/maps/forest/letter.png", False),
+    ("assets/maps/raw/dog-food.png", False),
+    (":resources:images/tiles/torch2.png", False),
+    (":resources:images/items/star.png", False),
+] + [
+    (path, flipped)
+    for path in [f"{MAIN_PATH}_idle.png"] + [f"{MAIN_PATH}_walk{i}.png" for i in range(WALK_FRAMES)]
+    for flipped in (False, True)
+]
+
+PRELOADED_MUSICS = [
+    "assets/sounds/intro.mp3",
+    "assets/sounds/present.mp3",
+    "assets/sounds/passe.mp3",
+    "assets/sounds/game_over_sound.mp3",
+]
+
+PRELOADED_TILEMAPS = [
+    (city.MAP_NAME, city.TILE_SCALING),
+    (forest.MAP_NAME, forest.TILE_SCALING),
+    (winter.MAP_NAME, winter.TILE_SCALING),
+]
+
+
+class LoadingJob:
+    """
+    One asset to load. prepare() runs on a worker thread (file reading, JSON
+    parsing, image decoding); its result gives the textures to upload to the
+    GPU and is then registered on the main thread.
+    """
+
+    def __init__(self, name, prepare, register, textures=lambda result: []):
+        self.name = name
+        self.prepare = prepare
+        self.register = register
+        self.textures = textures
+        self.result = None
+        # Exception raised by prepare(), the asset is then loaded when first used
+        self.error = None
+        self.prepare_time = 0
+        self.upload_time = 0
+        self.pending_textures = None
+
+    def run(self):
+        """ Called on the worker thread """
+        start = time.perf_counter()
+        try:
+            self.result = self.prepare()
+        except Exception as error:
+            self.error = error
+        self.prepare_time = time.perf_counter() - start
+        return self
+
+
+def texture_job(path, flipped_horizontally):
+    key = AssetManager.texture_key(path, flipped_horizontally)
+
+    def prepare():
+        texture, size = AssetManager.create_texture(*key[1:])
+        # The hit box is computed on first use, do it here instead
+        texture.hit_box_points
+        return texture, size
+
+    return LoadingJob(path + (" (flipped)" if flipped_horizontally else ""), prepare,
+                      lambda result: asset_manager.preload(key, *result),
+                      lambda result: [result[0]])
+
+
+def music_job(path):
+    return LoadingJob(path, lambda: Music(path),
+                      lambda music: asset_manager.preload(AssetManager.music_key(path), music, 0))
+
+
+def tilemap_job(map_file, scaling):
+    return LoadingJob(map_file, lambda: prepare_tilemap(map_file, scaling),
+                      lambda prepared: finish_tilemap(map_file, scaling, prepared),
+                      lambda prepared: prepared.get("textures", []))
+
+
+class LoadingView(arcade.View):
+    """
+    View shown while the assets are loaded on a thread pool. Only the
+    texture uploads run on the main thread, a few of them each frame, so the
+    window keeps responding. The game starts once everything is loaded.
+
+    An asset that fails on its worker is skipped with a warning: the game
+    loads it again on the main thread when it first needs it, as without
+    the loading screen, and only fails then if the asset is really broken.
+    """
+
+    def __init__(self, next_view_factory):
+        super().__init__()
+        self.next_view_factory = next_view_factory
+        self.jobs = ([tilemap_job(*tilemap) for tilemap in PRELOADED_TILEMAPS]
+                     + [texture_job(*texture) for texture in PRELOADED_TEXTURES]
+                     + [music_job(music) for music in PRELOADED_MUSICS])
+        self.executor = None
+        self.futures = []
+        # Jobs prepared by the workers and waiting for their textures upload
+        self.ready = deque()
+        self.done = []
+        self.start_time = None
+
+    def on_show_view(self):
+        arcade.set_background_color(arcade.color.BLACK)
+        self.start_time = time.perf_counter()
+        self.executor = ThreadPoolExecutor(max_workers=LOADING_WORKERS)
+        self.futures = [self.executor.submit(job.run) for job in self.jobs]
+
+    @property
+    def progress(self):
+        return len(self.done) / len(self.jobs) if self.jobs else 1
+
+    def on_update(self, delta_time):
+        # Collect the jobs finished by the workers
+        still_running = []
+        for future in self.futures:
+            if future.done():
+                job = future.result()
+                if job.error is not None:
+                    logger.warning("Could not preload %s, it will be loaded when needed: %r",
+                                   job.name, job.error)
+                    self.done.append(job)
+                    continue
+                job.pending_textures = deque(job.textures(job.result))
+                self.ready.append(job)
+            else:
+                still_running.append(future)
+        self.futures = still_running
+
+        # Upload textures until the budget of this frame is spent
+        atlas = self.window.ctx.default_atlas
+        frame_start = time.perf_counter()
+        while self.ready and time.perf_counter() - frame_start < LOADING_FRAME_BUDGET:
+            job = self.ready[0]
+            start = time.perf_counter()
+            if job.pending_textures:
+                atlas.add(job.pending_textures.popleft())
+            else:
+                job.register(job.result)
+                self.ready.popleft()
+                self.done.append(job)
+            job.upload_time += time.perf_counter() - start
+
+        if len(self.done) == len(self.jobs):
+            self.executor.shutdown()
+            self.log_report()
+            self.window.show_view(self.next_view_factory())
+
+    def log_report(self):
+        """ Log how long each asset took on the workers and on the main thread """
+        if not LOADING_REPORT:
+            return
+        lines = [f"Assets loaded in {time.perf_counter() - self.start_time:.2f}s",
+                 f"  {'asset':70} {'worker (ms)':>11} {'main (ms)':>9}"]
+        for job in sorted(self.done, key=lambda job: -(job.prepare_time + job.upload_time)):
+            lines.append(f"  {job.name:70} {job.prepare_time * 1000:11.1f} {job.upload_time * 1000:9.1f}")
+        logger.info("\n".join(lines))
+
+    def on_draw(self):
+        self.clear()
+        width = SCREEN_WIDTH // 2
+        left = (SCREEN_WIDTH - width) // 2
+
+        arcade.draw_text("Loading...", SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50,
+                         arcade.color.WHITE, 24, anchor_x="center", anchor_y="center")
+
+        # Progress bar
+        arcade.draw_lrtb_rectangle_outline(left, left + width, SCREEN_HEIGHT // 2 + 10,
+                                           SCREEN_HEIGHT // 2 - 10, arcade.color.WHITE, 2)
+        if self.progress > 0:
+            arcade.draw_lrtb_rectangle_filled(left, left + width * self.progress,
+                                              SCREEN_HEIGHT // 2 + 10, SCREEN_HEIGHT // 2 - 10,
+                                              arcade.color.GREEN)
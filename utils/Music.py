@@ -0,0 +1,57 @@
+import math
+from pathlib import Path
+
+import arcade
+import pyglet.media as media
+from arcade.resources import resolve_resource_path
+
+
+class Music(arcade.Sound):
+    """
+    Music decoded from disk in small buffers while it plays, instead of being
+    decoded whole in memory like arcade.load_sound does.
+
+    A pyglet streaming source can only be queued on one player, so a new one
+    is opened each time the music is played. It works with arcade.play_sound
+    and arcade.stop_sound like any other sound.
+    """
+
+    def __init__(self, file_name):
+        file_name = resolve_resource_path(file_name)
+        if not Path(file_name).is_file():
+            raise FileNotFoundError(
+                f"The music file '{file_name}' is not a file or can't be read.")
+        self.file_name = str(file_name)
+        self.source = None
+        self.min_distance = 100000000
+        # Players of this music, kept alive while they play
+        self.players = []
+
+    def open_source(self):
+        """ Open a new streaming decoder on the file """
+        return media.load(self.file_name, streaming=True)
+
+    def play(self, volume=1.0, pan=0.0, loop=False, speed=1.0):
+        player = media.Player()
+        player.volume = volume
+        player.position = (pan, 0.0, math.sqrt(1 - math.pow(pan, 2)))
+        player.pitch = speed
+        player.loop = loop
+        player.queue(self.open_source())
+        player.play()
+        # Forget the players stopped by arcade.stop_sound, keep the new one alive
+        self.players = [other for other in self.players if other.playing]
+        self.players.append(player)
+
+        def _on_player_eos():
+            if player in self.players:
+                self.players.remove(player)
+            player.on_player_eos = None
+
+        player.on_player_eos = _on_player_eos
+        return player
+
+    def get_length(self):
+        if self.source is None:
+            self.source = self.open_source()
+        return self.source.duration
@@ -0,0 +1,83 @@
+import arcade
+
+from constants import *
+
+
+class TimelineMusic:
+    """
+    Present and past musics started together and kept playing side by side.
+    Switching tense only moves the volumes: the audible track fades out while
+    the other one fades in, so no decoder is stopped or started.
+
+    The tracks loop on their own length and drift apart, so the incoming one
+    is moved to the position of the outgoing one (modulo its length) when
+    the tense switches.
+    """
+
+    def __init__(self, present_music, past_music, volume=MUSIC_VOLUME,
+                 fade_duration=MUSIC_FADE_DURATION):
+        self.musics = {PRESENT: present_music, PAST: past_music}
+        self.players = {}
+        # Lengths of the tracks in seconds, read when they are started
+        self.lengths = {}
+        self.volume = volume
+        self.fade_duration = fade_duration
+        self.temporal_state = PRESENT
+        self.volumes = {PRESENT: volume, PAST: 0.0}
+        self.fading = False
+
+    @property
+    def playing(self):
+        return bool(self.players)
+
+    def start(self, temporal_state=PRESENT):
+        """ Start both tracks at the same time, only one of them audible """
+        self.stop()
+        self.temporal_state = temporal_state
+        for state, music in self.musics.items():
+            self.volumes[state] = self.volume if state == temporal_state else 0.0
+            player = arcade.play_sound(music, volume=self.volumes[state], looping=True)
+            if player is not None:
+                self.players[state] = player
+                self.lengths[state] = music.get_length()
+        self.fading = False
+
+    def stop(self):
+        for player in self.players.values():
+            arcade.stop_sound(player)
+        self.players = {}
+        self.fading = False
+
+    def set_tense(self, temporal_state):
+        """ Make the track of the given tense the audible one (constant cost) """
+        if temporal_state != self.temporal_state:
+            self.align(self.temporal_state, temporal_state)
+        self.temporal_state = temporal_state
+        self.fading = self.playing
+
+    def align(self, outgoing, incoming):
+        """ Seek the incoming track to where the outgoing one is """
+        if outgoing not in self.players or incoming not in self.players:
+            return
+        length = self.lengths.get(incoming)
+        if not length:
+            return
+        self.players[incoming].seek(self.players[outgoing].time % length)
+
+    def update(self, delta_time):
+        """ Move the volumes towards the current tense, called every frame """
+        if not self.fading:
+            return
+        step = self.volume * delta_time / self.fade_duration if self.fade_duration else self.volume
+        self.fading = False
+        for state, player in self.players.items():
+            target = self.volume if state == self.temporal_state else 0.0
+            current = self.volumes[state]
+            if current < target:
+                current = min(target, current + step)
+            elif current > target:
+                current = max(target, current - step)
+            self.volumes[state] = current
+            player.volume = current
+            if current != target:
+                self.fading = True
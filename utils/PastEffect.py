@@ -0,0 +1,114 @@
+import arcade
+from arcade.gl import geometry
+
+from constants import *
+from utils.tense import Tense
+
+VERTEX_SHADER = """
+#version 330
+
+in vec2 in_vert;
+in vec2 in_uv;
+out vec2 v_uv;
+
+void main() {
+    gl_Position = vec4(in_vert, 0.0, 1.0);
+    v_uv = in_uv;
+}
+"""
+
+# Faded black and white picture with dark borders, mixed with the original
+# colors by "amount" (0 in the present, 1 in the past)
+FRAGMENT_SHADER = """
+#version 330
+
+uniform sampler2D scene;
+uniform float amount;
+uniform float fading;
+uniform float vignette;
+
+in vec2 v_uv;
+out vec4 f_color;
+
+void main() {
+    vec3 color = texture(scene, v_uv).rgb;
+    float grey = dot(color, vec3(0.299, 0.587, 0.114));
+    vec3 past = mix(vec3(grey), vec3(0.5), fading);
+
+    vec2 offset = (v_uv - 0.5) * 2.0;
+    past *= 1.0 - vignette * smoothstep(0.6, 1.4, length(offset));
+
+    f_color = vec4(mix(color, past, amount), 1.0);
+}
+"""
+
+
+class PastEffect:
+    """
+    Post-processing pass giving its look to the past. The scene is drawn in
+    an offscreen texture, then copied to the screen through a shader that
+    desaturates it and darkens the borders. Switching tense blends the
+    effect in or out over PAST_TRANSITION_DURATION seconds.
+    """
+
+    def __init__(self, duration=PAST_TRANSITION_DURATION):
+        self.duration = duration
+        # 0 in the present, 1 in the past
+        self.amount = 0.0
+        self.target = 0.0
+        self.framebuffer = None
+        self.program = None
+        self.quad = None
+
+    def reset(self):
+        self.amount = 0.0
+        self.target = 0.0
+
+    @property
+    def transitioning(self):
+        return self.amount != self.target
+
+    def set_tense(self, tense):
+        self.target = 1.0 if tense == Tense.PAST else 0.0
+
+    def update(self, delta_time):
+        """ Move the effect towards the current tense, called every frame """
+        if self.amount == self.target:
+            return
+        step = delta_time / self.duration if self.duration else 1.0
+        if self.amount < self.target:
+            self.amount = min(self.target, self.amount + step)
+        else:
+            self.amount = max(self.target, self.amount - step)
+
+    def setup(self):
+        window = arcade.get_window()
+        ctx = window.ctx
+        self.framebuffer = ctx.framebuffer(color_attachments=[
+            ctx.texture(window.get_framebuffer_size(), components=4)])
+        self.program = ctx.program(vertex_shader=VERTEX_SHADER,
+                                   fragment_shader=FRAGMENT_SHADER)
+        self.program["fading"] = PAST_FADING
+        self.program["vignette"] = PAST_VIGNETTE
+        self.quad = geometry.quad_2d_fs()
+
+    def draw(self, draw_scene, tense):
+        """
+        Draw the scene with the effect of the given tense. In the present,
+        once the transition is over, the scene is drawn directly.
+        """
+        self.set_tense(tense)
+        if self.amount == 0:
+            draw_scene()
+            return
+
+        if self.framebuffer is None:
+            self.setup()
+        with self.framebuffer.activate():
+            self.framebuffer.clear(arcade.get_window().background_color)
+            draw_scene()
+
+        self.framebuffer.color_attachments[0].use(0)
+        self.program["amount"] = self.amount
+        with self.framebuffer.ctx.enabled_only():
+            self.quad.render(self.program)
@@ -0,0 +1,64 @@
+import numpy as np
+
+# Above this number of pairs, the points are bucketed in a grid first
+BRUTE_FORCE_PAIRS = 65536
+
+
+def sprite_positions(sprites):
+    """ Centers of some sprites as an (n, 2) array """
+    return np.array([sprite.position for sprite in sprites], dtype=float).reshape(-1, 2)
+
+
+def near_mask(points, others, radius):
+    """
+    For each of the points (an (n, 2) array), whether one of the others
+    (an (m, 2) array) is strictly closer than radius. Distances are
+    compared squared. Small sets are compared pair by pair in one numpy
+    operation, large ones through a grid of cells of the size of radius,
+    so only the points of the 9 cells around each point are compared.
+    """
+    hits = np.zeros(len(points), dtype=bool)
+    if len(points) == 0 or len(others) == 0 or radius <= 0:
+        return hits
+    radius_squared = radius * radius
+
+    if len(points) * len(others) <= BRUTE_FORCE_PAIRS:
+        offsets = points[:, None, :] - others[None, :, :]
+        return ((offsets ** 2).sum(axis=2) < radius_squared).any(axis=1)
+
+    # Sort the others by cell, each cell is then a range of the sorted array
+    origin = np.minimum(points.min(axis=0), others.min(axis=0))
+    other_cells = np.floor((others - origin) / radius).astype(np.int64)
+    point_cells = np.floor((points - origin) / radius).astype(np.int64)
+    # One more column on each side, so neighbour keys never wrap around
+    width = max(other_cells[:, 0].max(), point_cells[:, 0].max()) + 3
+    other_keys = (other_cells[:, 1] + 1) * width + other_cells[:, 0] + 1
+    order = np.argsort(other_keys, kind="stable")
+    sorted_keys = other_keys[order]
+    sorted_others = others[order]
+    point_keys = (point_cells[:, 1] + 1) * width + point_cells[:, 0] + 1
+
+    point_indices = np.arange(len(points))
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            keys = point_keys + dy * width + dx
+            starts = np.searchsorted(sorted_keys, keys, side="left")
+            counts = np.searchsorted(sorted_keys, keys, side="right") - starts
+            total = counts.sum()
+            if total == 0:
+                continue
+            # Every (point, other) pair of the cell, without a Python loop
+            pair_points = np.repeat(point_indices, counts)
+            first_pair = np.repeat(np.cumsum(counts) - counts, counts)
+            pair_others = np.repeat(starts, counts) + np.arange(total) - first_pair
+            offsets = points[pair_points] - sorted_others[pair_others]
+            close = (offsets ** 2).sum(axis=1) < radius_squared
+            hits[pair_points[close]] = True
+    return hits
+
+
+def near_sprites(sprites, others, radius):
+    """ Sprites closer than radius to one of the others, in their order """
+    sprites = list(sprites)
+    hits = near_mask(sprite_positions(sprites), sprite_positions(others), radius)
+    return [sprite for sprite, hit in zip(sprites, hits) if hit]
@@ -0,0 +1,72 @@
+import arcade
+from arcade.gl import geometry
+
+
+class StaticLayerCache:
+    """
+    Draws the tile layers of a scene that never move (terrain, walls,
+    buildings...) once into an offscreen texture, then shows that texture
+    with a single full-screen quad each frame. Only the other layers are
+    drawn sprite by sprite.
+
+    One texture is kept for each combination of visible static layers, so
+    switching tense does not redraw anything after the first time.
+
+    The texture is drawn below all the other layers, so the static layers
+    must be the first ones of the scene to keep the order of the map.
+    """
+
+    def __init__(self, scene, static_layers):
+        self.scene = scene
+        self.static_layers = list(static_layers)
+        first_layers = list(scene.name_mapping)[:len(self.static_layers)]
+        assert sorted(first_layers) == sorted(self.static_layers), \
+            f"static layers {self.static_layers} are not the first of the scene {first_layers}"
+        # Baked textures by visibility of the static layers
+        self.framebuffers = {}
+        self.program = None
+        self.quad = None
+        self.bakes = 0
+
+    @property
+    def dynamic_layers(self):
+        """ Layers drawn every frame, in the order of the scene """
+        return [name for name in self.scene.name_mapping if name not in self.static_layers]
+
+    def key(self):
+        return tuple(self.scene[name].visible for name in self.static_layers)
+
+    def invalidate(self):
+        """ Forget the baked textures, to call when a static layer is modified """
+        self.framebuffers.clear()
+
+    def bake(self, key):
+        """ Draw the visible static layers into a new offscreen texture """
+        window = arcade.get_window()
+        ctx = window.ctx
+        if self.program is None:
+            self.program = ctx.load_program(
+                vertex_shader=":resources:shaders/texture_default_projection_vs.glsl",
+                fragment_shader=":resources:shaders/texture_fs.glsl",
+            )
+            self.quad = geometry.quad_2d_fs()
+
+        framebuffer = ctx.framebuffer(color_attachments=[
+            ctx.texture(window.get_framebuffer_size(), components=4, filter=(ctx.NEAREST, ctx.NEAREST))])
+        with framebuffer.activate():
+            framebuffer.clear(window.background_color)
+            self.scene.draw(names=[name for name, visible in zip(self.static_layers, key)
+                                   if visible])
+        self.framebuffers[key] = framebuffer
+        self.bakes += 1
+        return framebuffer
+
+    def draw(self):
+        """ Draw the whole scene, the static layers coming from their texture """
+        key = self.key()
+        framebuffer = self.framebuffers.get(key) or self.bake(key)
+        framebuffer.color_attachments[0].use(0)
+        # The texture is opaque and replaces what is behind it
+        with framebuffer.ctx.enabled_only():
+            self.quad.render(self.program)
+        self.scene.draw(names=self.dynamic_layers)
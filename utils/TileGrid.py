@@ -0,0 +1,174 @@
+import math
+
+import numpy as np
+from arcade import are_polygons_intersecting
+
+
+def polygon_area(points):
+    """ Area of a polygon (shoelace formula) """
+    area = 0.0
+    for i, (x1, y1) in enumerate(points):
+        x2, y2 = points[(i + 1) % len(points)]
+        area += x1 * y2 - x2 * y1
+    return abs(area) / 2
+
+
+def merge_cells(solid):
+    """
+    Cover the True cells of a boolean array with axis-aligned rectangles,
+    greedily: each rectangle grows along the row as far as it can, then
+    row by row while the whole span is solid. Returns a list of
+    (row, column, height, width).
+    """
+    free = solid.copy()
+    rows, columns = free.shape
+    rectangles = []
+    for row in range(rows):
+        column = 0
+        while column < columns:
+            if not free[row, column]:
+                column += 1
+                continue
+            width = 1
+            while column + width < columns and free[row, column + width]:
+                width += 1
+            height = 1
+            while row + height < rows and free[row + height, column:column + width].all():
+                height += 1
+            free[row:row + height, column:column + width] = False
+            rectangles.append((row, column, height, width))
+            column += width
+    return rectangles
+
+
+class TileGrid:
+    """
+    Occupancy of the tile layers that never move, stored cell by cell.
+
+    Each layer gets a bit in a mask array of the size of the map. The tiles
+    whose hit box fills their cell are merged with their neighbours into
+    rectangles, the other tiles keep their own hit box, and every cell
+    points to the collider covering it. Testing a box against some layers
+    only looks at the few cells under the box, so it does not depend on
+    how many tiles the layers have. When the boxes overlap, the hit box
+    polygons are compared like arcade does, so the result is the same as a
+    sprite collision test.
+    """
+
+    def __init__(self, tile_map, layers):
+        self.columns = tile_map.width
+        self.rows = tile_map.height
+        self.cell_width = tile_map.tile_width * tile_map.scaling
+        self.cell_height = tile_map.tile_height * tile_map.scaling
+        self.bits = {}
+        # One bit per layer, a cell can hold a tile of several layers
+        self.mask = np.zeros((self.rows, self.columns), dtype=np.uint32)
+        # (left, bottom, right, top, polygon) of the colliders of each layer
+        self.colliders = {}
+        # Index of the collider covering each cell, by layer (-1 when empty)
+        self.collider_ids = {}
+        self.tile_counts = {}
+
+        for name in layers:
+            self.add_layer(name, tile_map.sprite_lists[name])
+
+        # Plain lists are much faster than numpy for one cell at a time
+        self.cells = self.mask.tolist()
+        self.cell_colliders = {name: ids.tolist() for name, ids in self.collider_ids.items()}
+
+    def add_layer(self, name, sprite_list):
+        if len(self.bits) == 32:
+            raise ValueError("A tile grid holds at most 32 layers")
+        bit = 1 << len(self.bits)
+        self.bits[name] = bit
+        cell_area = self.cell_width * self.cell_height
+        full = np.zeros((self.rows, self.columns), dtype=bool)
+        ids = np.full((self.rows, self.columns), -1, dtype=np.int32)
+        colliders = []
+        tiles = 0
+
+        for sprite in sprite_list:
+            column = int(sprite.center_x // self.cell_width)
+            row = int(sprite.center_y // self.cell_height)
+            if not (0 <= column < self.columns and 0 <= row < self.rows):
+                continue
+            tiles += 1
+            self.mask[row, column] |= bit
+            polygon = sprite.get_adjusted_hit_box()
+            if math.isclose(polygon_area(polygon), cell_area):
+                # Same as the cell, merged with its neighbours below
+                full[row, column] = True
+            else:
+                ids[row, column] = len(colliders)
+                colliders.append((sprite.left, sprite.bottom, sprite.right, sprite.top,
+                                  polygon))
+
+        for row, column, height, width in merge_cells(full):
+            left = column * self.cell_width
+            bottom = row * self.cell_height
+            right = left + width * self.cell_width
+            top = bottom + height * self.cell_height
+            ids[row:row + height, column:column + width] = len(colliders)
+            colliders.append((left, bottom, right, top,
+                              ((left, bottom), (right, bottom), (right, top), (left, top))))
+
+        self.colliders[name] = colliders
+        self.collider_ids[name] = ids
+        self.tile_counts[name] = tiles
+
+    def occupancy(self, name):
+        """ Boolean array of the cells holding a tile of a layer """
+        return (self.mask & self.bits[name]) != 0
+
+    def collider_counts(self):
+        """ Number of tiles and of colliders of each layer """
+        return {name: (self.tile_counts[name], len(self.colliders[name]))
+                for name in self.bits}
+
+    def layer_mask(self, names):
+        """ Mask of some layers, to give to collides() """
+        mask = 0
+        for name in names:
+            mask |= self.bits[name]
+        return mask
+
+    def collides(self, mask, left, bottom, right, top, sprite=None):
+        """
+        Whether a box overlaps a collider of the layers in mask. With the
+        sprite whose hit box fits in the box, the polygons are compared too.
+        Touching edges do not collide, like in arcade.
+        """
+        first_column = max(0, int(math.floor(left / self.cell_width)))
+        last_column = min(self.columns - 1, int(math.floor(right / self.cell_width)))
+        first_row = max(0, int(math.floor(bottom / self.cell_height)))
+        last_row = min(self.rows - 1, int(math.floor(top / self.cell_height)))
+        tested = set()
+        for row in range(first_row, last_row + 1):
+            cells = self.cells[row]
+            for column in range(first_column, last_column + 1):
+                bits = cells[column] & mask
+                if not bits:
+                    continue
+                for name, bit in self.bits.items():
+                    if not bits & bit:
+                        continue
+                    index = self.cell_colliders[name][row][column]
+                    # A merged collider covers several cells, test it once
+                    if (name, index) in tested:
+                        continue
+                    tested.add((name, index))
+                    box_left, box_bottom, box_right, box_top, polygon = \
+                        self.colliders[name][index]
+                    if (left < box_right and right > box_left
+                            and bottom < box_top and top > box_bottom
+                            and (sprite is None or are_polygons_intersecting(
+                                sprite.get_adjusted_hit_box(), polygon))):
+                        return True
+        return False
+
+    def sprite_collides(self, sprite, mask):
+        """ Same as arcade.check_for_collision_with_list on the layers in mask """
+        points = sprite.get_adjusted_hit_box()
+        xs = [x for x, _ in points]
+        ys = [y for _, y in points]
+        return self.collides(mask, min(xs), min(ys), max(xs), max(ys), sprite)
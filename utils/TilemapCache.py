@@ -0,0 +1,296 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from xml.etree import ElementTree
+
+import arcade
+import PIL.Image
+import pytiled_parser
+
+try:
+    # Private helpers of arcade 2.6, only needed to compile a map. The arcade
+    # version is part of the hash, so a newer one compiles its maps again.
+    from arcade.tilemap.tilemap import _get_image_info_from_tileset, _get_image_source
+except ImportError:
+    _get_image_info_from_tileset = _get_image_source = None
+
+logger = logging.getLogger(__name__)
+
+# Folder where the compiled maps are written
+CACHE_DIRECTORY = "assets/maps/cache"
+# Bump this when the layout of the compiled file changes
+CACHE_VERSION = 2
+
+# Maps prepared by the loading screen, used once by load_tilemap
+prepared_tilemaps = {}
+
+
+class CompiledTileMap:
+    """
+    Tile map rebuilt from a compiled cache file. It exposes the same
+    attributes as arcade.TileMap that the maps use, so it can be given to
+    arcade.Scene.from_tilemap.
+    """
+
+    def __init__(self, data, layer_options=None, textures=None):
+        self.width = data["width"]
+        self.height = data["height"]
+        self.tile_width = data["tile_width"]
+        self.tile_height = data["tile_height"]
+        self.scaling = data["scaling"]
+        self.sprite_lists = OrderedDict()
+        self.object_lists = OrderedDict()
+
+        # Textures are shared by every tile that uses the same atlas coordinates
+        if textures is None:
+            textures = [
+                arcade.load_texture(path, x, y, width, height,
+                                    flipped_horizontally=flip_h,
+                                    flipped_vertically=flip_v,
+                                    flipped_diagonally=flip_d,
+                                    hit_box_algorithm="None")
+                for path, x, y, width, height, flip_h, flip_v, flip_d in data["textures"]
+            ]
+        hit_boxes = data["hit_boxes"]
+
+        for layer in data["layers"]:
+            options = (layer_options or {}).get(layer["name"], {})
+            sprite_list = arcade.SpriteList(
+                use_spatial_hash=options.get("use_spatial_hash"))
+            positions = array("d")
+            positions.frombytes(layer["positions"])
+            texture_ids = array("H")
+            texture_ids.frombytes(layer["textures"])
+            hit_box_ids = array("H")
+            hit_box_ids.frombytes(layer["hit_boxes"])
+
+            for i, texture_id in enumerate(texture_ids):
+                sprite = arcade.Sprite(texture=textures[texture_id], scale=self.scaling)
+                sprite.set_hit_box(hit_boxes[hit_box_ids[i]])
+                sprite.center_x = positions[2 * i]
+                sprite.center_y = positions[2 * i + 1]
+                sprite.alpha = layer["alpha"]
+                sprite_list.append(sprite)
+
+            sprite_list.visible = layer["visible"]
+            self.sprite_lists[layer["name"]] = sprite_list
+
+
+def tileset_images(tileset, directory):
+    """ Image files of a tileset given as JSON (embedded in the map or external) """
+    sources = [tileset.get("image")] + [tile.get("image") for tile in tileset.get("tiles", [])]
+    return [os.path.join(directory, source) for source in sources if source]
+
+
+def tileset_file_images(tileset_file):
+    """ Image files of an external tileset, .tsx or .json """
+    directory = os.path.dirname(tileset_file)
+    if tileset_file.endswith(".tsx"):
+        root = ElementTree.parse(tileset_file).getroot()
+        return [os.path.join(directory, image.get("source"))
+                for image in root.iter("image") if image.get("source")]
+    with open(tileset_file, "rb") as file:
+        return tileset_images(json.load(file), directory)
+
+
+def source_hash(map_file, scaling):
+    """
+    Hash of the map file, its tilesets and their images (the hit boxes come
+    from the pixels), the load parameters and the arcade version
+    """
+    digest = hashlib.sha1(f"{CACHE_VERSION}:{arcade.VERSION}:{scaling}".encode())
+    with open(map_file, "rb") as file:
+        content = file.read()
+    digest.update(content)
+    map_directory = os.path.dirname(map_file)
+    images = []
+    for tileset in json.loads(content).get("tilesets", []):
+        if "source" in tileset:
+            tileset_file = os.path.join(map_directory, tileset["source"])
+            with open(tileset_file, "rb") as file:
+                digest.update(file.read())
+            images.extend(tileset_file_images(tileset_file))
+        else:
+            images.extend(tileset_images(tileset, map_directory))
+    for image in images:
+        with open(image, "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def cache_path(map_file, digest):
+    name = os.path.splitext(os.path.basename(map_file))[0]
+    return os.path.join(CACHE_DIRECTORY, f"{name}.{digest[:16]}.bin")
+
+
+def compile_tilemap(map_file, scaling, layer_options=None, digest=None, tiled_map=None):
+    """
+    Load a map with arcade, write its compiled version in the cache folder
+    and return the arcade.TileMap that was loaded. An already parsed map
+    (tiled_map) can be given to skip the JSON parsing.
+    """
+    digest = digest or source_hash(map_file, scaling)
+    tile_map = arcade.TileMap(map_file, scaling, layer_options=layer_options,
+                              tiled_map=tiled_map)
+    if _get_image_source is None or not hasattr(tile_map, "_get_tile_by_gid"):
+        logger.warning("This arcade version cannot compile %s, it is loaded from the JSON file",
+                       map_file)
+        return tile_map
+    map_directory = os.path.dirname(tile_map.tiled_map.map_file)
+
+    textures = []
+    texture_index = {}
+    hit_boxes = []
+    hit_box_index = {}
+    layers = []
+
+    for layer in tile_map.tiled_map.layers:
+        if not isinstance(layer, pytiled_parser.TileLayer):
+            raise ValueError(f"Layer '{layer.name}' of {map_file} is not a tile layer")
+        sprite_list = tile_map.sprite_lists[layer.name]
+        gids = array("I")
+        positions = array("d")
+        texture_ids = array("H")
+        hit_box_ids = array("H")
+
+        # Same traversal as arcade, so the n-th tile matches the n-th sprite
+        cells = [item for row in layer.data for item in row if item != 0]
+        for gid, sprite in zip(cells, sprite_list):
+            tile = tile_map._get_tile_by_gid(gid)
+            image_x, image_y, width, height = _get_image_info_from_tileset(tile)
+            # Relative to the map, so the cache does not depend on the working directory
+            image_file = os.path.relpath(_get_image_source(tile, map_directory),
+                                         os.path.dirname(os.path.abspath(map_file)))
+            key = (image_file, image_x, image_y, width, height,
+                   tile.flipped_horizontally, tile.flipped_vertically,
+                   tile.flipped_diagonally)
+            if key not in texture_index:
+                texture_index[key] = len(textures)
+                textures.append(key)
+
+            points = tuple(tuple(point) for point in sprite.get_hit_box())
+            if points not in hit_box_index:
+                hit_box_index[points] = len(hit_boxes)
+                hit_boxes.append(points)
+
+            gids.append(gid)
+            positions.extend((sprite.center_x, sprite.center_y))
+            texture_ids.append(texture_index[key])
+            hit_box_ids.append(hit_box_index[points])
+
+        layers.append({
+            "name": layer.name,
+            "visible": layer.visible,
+            "alpha": int(layer.opacity * 255) if layer.opacity else 255,
+            "gids": gids.tobytes(),
+            "positions": positions.tobytes(),
+            "textures": texture_ids.tobytes(),
+            "hit_boxes": hit_box_ids.tobytes(),
+        })
+
+    data = {
+        "version": CACHE_VERSION,
+        "source_hash": digest,
+        "scaling": scaling,
+        "width": tile_map.width,
+        "height": tile_map.height,
+        "tile_width": tile_map.tile_width,
+        "tile_height": tile_map.tile_height,
+        "textures": textures,
+        "hit_boxes": hit_boxes,
+        "layers": layers,
+    }
+
+    try:
+        os.makedirs(CACHE_DIRECTORY, exist_ok=True)
+        # Remove the files compiled from an older version of this map
+        prefix = os.path.splitext(os.path.basename(map_file))[0] + "."
+        for old_file in os.listdir(CACHE_DIRECTORY):
+            if old_file.startswith(prefix) and old_file.endswith(".bin"):
+                os.remove(os.path.join(CACHE_DIRECTORY, old_file))
+        with open(cache_path(map_file, digest), "wb") as file:
+            pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as error:
+        logger.warning("Could not write the compiled map for %s: %s", map_file, error)
+
+    return tile_map
+
+
+def read_compiled_tilemap(map_file, scaling):
+    """ Return the compiled data of a map, or None if it is missing or outdated """
+    digest = source_hash(map_file, scaling)
+    path = cache_path(map_file, digest)
+    if not os.path.exists(path):
+        return None, digest
+    with open(path, "rb") as file:
+        data = pickle.load(file)
+    if data.get("version") != CACHE_VERSION or data.get("source_hash") != digest:
+        return None, digest
+    # The images are stored relative to the map file
+    map_directory = os.path.dirname(os.path.abspath(map_file))
+    data["textures"] = [(os.path.normpath(os.path.join(map_directory, path)),) + tuple(rest)
+                        for path, *rest in data["textures"]]
+    return data, digest
+
+
+def create_tile_textures(data):
+    """
+    Cut the tile textures of a compiled map out of their tilesets. It only
+    uses Pillow, so it can run on a worker thread.
+    """
+    tilesets = {}
+    textures = []
+    for path, x, y, width, height, flip_h, flip_v, flip_d in data["textures"]:
+        if path not in tilesets:
+            tilesets[path] = PIL.Image.open(path).convert("RGBA")
+        image = tilesets[path].crop((x, y, x + width, y + height))
+        # Same order as arcade.load_texture
+        if flip_d:
+            image = image.transpose(PIL.Image.TRANSPOSE)
+        if flip_h:
+            image = image.transpose(PIL.Image.FLIP_LEFT_RIGHT)
+        if flip_v:
+            image = image.transpose(PIL.Image.FLIP_TOP_BOTTOM)
+        name = f"{path}-{x}-{y}-{width}-{height}-{flip_h}-{flip_v}-{flip_d}-tile"
+        textures.append(arcade.Texture(name, image, hit_box_algorithm="None"))
+    return textures
+
+
+def prepare_tilemap(map_file, scaling):
+    """
+    Do the file and image work of loading a map: read the compiled cache and
+    cut its textures, or parse the JSON file when the cache is outdated.
+    Safe to run on a worker thread, the result goes to finish_tilemap.
+    """
+    data, digest = read_compiled_tilemap(map_file, scaling)
+    if data is None:
+        return {"digest": digest, "tiled_map": pytiled_parser.parse_map(Path(map_file))}
+    return {"data": data, "textures": create_tile_textures(data)}
+
+
+def finish_tilemap(map_file, scaling, prepared):
+    """ Keep a prepared map for the next load_tilemap call (main thread) """
+    prepared_tilemaps[(map_file, scaling)] = prepared
+
+
+def load_tilemap(map_file, scaling, layer_options=None):
+    """
+    Load a map from its compiled cache, falling back to the JSON file (and
+    compiling it for the next launch) when the source changed.
+    """
+    prepared = prepared_tilemaps.pop((map_file, scaling), None)
+    if prepared is not None:
+        if "data" in prepared:
+            return CompiledTileMap(prepared["data"], layer_options, prepared["textures"])
+        return compile_tilemap(map_file, scaling, layer_options,
+                               prepared["digest"], prepared["tiled_map"])
+
+    data, digest = read_compiled_tilemap(map_file, scaling)
+    if data is None:
+        return compile_tilemap(map_file, scaling, layer_options, digest)
+    return CompiledTileMap(data, layer_options)
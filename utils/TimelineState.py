@@ -0,0 +1,29 @@
+import itertools
+
+from utils.tense import Tense
+
+
+class TimelineState:
+    """
+    What a map shows in one tense at one step of its puzzle: which of the
+    layers that change are visible, and the walls the player bumps into.
+    The states are built when the map is loaded and never modified,
+    switching tense only picks another one.
+    """
+
+    def __init__(self, scene, layers, visible_layers, walls, physics_engine):
+        # Visible layers in the order of the scene
+        self.visible_layers = tuple(name for name in layers if name in visible_layers)
+        self.visibility = tuple((scene[name], name in visible_layers) for name in layers)
+        self.walls = tuple(scene[name] for name in walls)
+        self.physics_engine = physics_engine
+
+    def apply(self):
+        """ Show and hide the layers, without allocating anything """
+        for sprite_list, visible in self.visibility:
+            sprite_list.visible = visible
+
+
+def timeline_keys(progress_flags):
+    """ Every combination of a tense and the given number of progress flags """
+    return itertools.product(Tense, *([(False, True)] * progress_flags))
@@ -0,0 +1,57 @@
+class ViewRegistry:
+    """
+    Holds the map views of the game and only builds each one the first time
+    it is needed, so the start of the game only pays for the introduction.
+    """
+
+    def __init__(self, factories, prefetching=False):
+        # One factory (callable without arguments) per map view
+        self.factories = list(factories)
+        self.views = [None] * len(self.factories)
+        # Whether prefetch() remembers views to build ahead of time
+        self.prefetching = prefetching
+        self.pending_prefetch = set()
+
+    def __len__(self):
+        return len(self.factories)
+
+    def __getitem__(self, index):
+        return self.get(index)
+
+    def get(self, index):
+        """ Return the view at the given index, building it if needed """
+        if self.views[index] is None:
+            self.views[index] = self.factories[index]()
+        return self.views[index]
+
+    def is_built(self, index):
+        return self.views[index] is not None
+
+    def built_views(self):
+        """ Return the views that have already been built """
+        return [view for view in self.views if view is not None]
+
+    def prefetch(self, index):
+        """
+        Remember to build a view before the player reaches it. The view is
+        built on the main thread because the sprite lists need the OpenGL
+        context, by build_pending(), when the game has time to spare.
+        """
+        if not self.prefetching:
+            return
+        index = index % len(self)
+        if not self.is_built(index):
+            self.pending_prefetch.add(index)
+
+    def build_pending(self):
+        """ Build one prefetched view, return whether one was built """
+        while self.pending_prefetch:
+            index = self.pending_prefetch.pop()
+            if not self.is_built(index):
+                self.get(index)
+                return True
+        return False
+
+    def cancel_prefetch(self):
+        """ Forget the views waiting to be prefetched """
+        self.pending_prefetch.clear()
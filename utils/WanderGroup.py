@@ -0,0 +1,86 @@
+import numpy as np
+
+from utils.Proximity import sprite_positions
+
+# Moves of the direction codes: up, down, left, right
+DIRECTIONS = np.array([(0, 1), (0, -1), (-1, 0), (1, 0)], dtype=float)
+
+
+class WanderGroup:
+    """
+    Sprites walking straight in a random direction around their home, and
+    picking another direction when they would hit a wall, leave the map or
+    go too far (monsters...). Homes, positions, direction codes and the
+    random generator are numpy arrays made when the map is loaded, and all
+    the sprites are moved in one step per frame.
+
+    The walls are looked up in a summed-area table of the occupancy of the
+    tile grid, which tells in O(1) whether a box touches a wall cell. Only
+    the sprites touching one are tested against the colliders.
+    """
+
+    def __init__(self, sprite_list, tile_grid, wall_layers, width, height, seed=None):
+        self.sprite_list = sprite_list
+        self.grid = tile_grid
+        self.mask = tile_grid.layer_mask(wall_layers)
+        self.width = width
+        self.height = height
+        self.rng = np.random.default_rng(seed)
+
+        occupied = (tile_grid.mask & self.mask) != 0
+        # Number of wall cells below and left of each corner of the grid
+        self.wall_cells = np.zeros((tile_grid.rows + 1, tile_grid.columns + 1), dtype=np.int32)
+        self.wall_cells[1:, 1:] = occupied.cumsum(axis=0).cumsum(axis=1)
+
+        self.sprites = list(sprite_list)
+        self.homes = sprite_positions(self.sprites)
+        self.positions = self.homes.copy()
+        # left, bottom, right, top of the hit box around the center
+        self.extents = np.array([(sprite.left - sprite.center_x, sprite.bottom - sprite.center_y,
+                                  sprite.right - sprite.center_x, sprite.top - sprite.center_y)
+                                 for sprite in self.sprites], dtype=float).reshape(-1, 4)
+        self.directions = self.rng.integers(0, len(DIRECTIONS), len(self.sprites))
+
+    def sync(self):
+        """ Read the positions again, after the sprites were put back by a reset """
+        self.positions = sprite_positions(self.sprites)
+
+    def touches_walls(self, positions):
+        """ For each position, whether the hit box covers a wall cell """
+        grid = self.grid
+        boxes = positions[:, [0, 1, 0, 1]] + self.extents
+        first_columns = np.clip(np.floor(boxes[:, 0] / grid.cell_width), 0, grid.columns).astype(int)
+        first_rows = np.clip(np.floor(boxes[:, 1] / grid.cell_height), 0, grid.rows).astype(int)
+        last_columns = np.clip(np.floor(boxes[:, 2] / grid.cell_width) + 1, 0, grid.columns).astype(int)
+        last_rows = np.clip(np.floor(boxes[:, 3] / grid.cell_height) + 1, 0, grid.rows).astype(int)
+        cells = self.wall_cells
+        count = (cells[last_rows, last_columns] - cells[first_rows, last_columns]
+                 - cells[last_rows, first_columns] + cells[first_rows, first_columns])
+        return count > 0
+
+    def update(self, step, radius):
+        """ Move every sprite by step, without going further than radius from home """
+        if not self.sprites:
+            return
+        moved = self.positions + DIRECTIONS[self.directions] * step
+        offsets = moved - self.homes
+        blocked = ((moved[:, 0] < 0) | (moved[:, 0] > self.width)
+                   | (moved[:, 1] < 0) | (moved[:, 1] > self.height)
+                   | ((offsets ** 2).sum(axis=1) > radius * radius))
+
+        # Exact test of the few sprites near a wall
+        for index in np.flatnonzero(~blocked & self.touches_walls(moved)).tolist():
+            sprite = self.sprites[index]
+            sprite.position = tuple(moved[index].tolist())
+            if self.grid.sprite_collides(sprite, self.mask):
+                blocked[index] = True
+                sprite.position = tuple(self.positions[index].tolist())
+
+        free = np.flatnonzero(~blocked)
+        self.positions[free] = moved[free]
+        for index, position in zip(free.tolist(), moved[free].tolist()):
+            self.sprites[index].position = tuple(position)
+
+        # Pick a new direction for the blocked ones
+        stuck = np.flatnonzero(blocked)
+        self.directions[stuck] = self.rng.integers(0, len(DIRECTIONS), len(stuck))